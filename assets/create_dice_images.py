@@ -1,8 +1,13 @@
+import os
 import pygame
 import random
 import sys
 import time
 
+# Share the board definition with the main game
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from board import DEFAULT_BOARD  # noqa: E402
+
 # Initialize pygame
 pygame.init()
 
@@ -28,13 +33,8 @@ BROWN = (165, 42, 42)
 DARK_GREEN = (0, 100, 0)
 
 # Define snakes and ladders
-snakes = {
-    16: 6, 47: 26, 49: 11, 56: 53, 62: 19, 64: 60, 87: 24, 93: 73, 95: 75, 98: 78
-}
-
-ladders = {
-    1: 38, 4: 14, 9: 31, 21: 42, 28: 84, 36: 44, 51: 67, 71: 91, 80: 100
-}
+snakes = DEFAULT_BOARD.snakes
+ladders = DEFAULT_BOARD.ladders
 
 class Player:
     def __init__(self, number, color):
@@ -48,13 +48,8 @@ class Player:
         if self.position > 100:
             self.position = 100 - (self.position - 100)
         
-        # Check for snakes
-        if self.position in snakes:
-            self.position = snakes[self.position]
-            
-        # Check for ladders
-        if self.position in ladders:
-            self.position = ladders[self.position]
+        # Apply snakes and ladders from the compiled jump array
+        self.position = DEFAULT_BOARD.jumps[self.position]
             
         if self.position == 100:
             self.won = True
@@ -70,6 +65,8 @@ class Dice:
         self.value = 1
         self.rolling = False
         self.roll_start_time = 0
+        # Face surfaces, built on first use instead of every frame
+        self.surfaces = {}
         
     def create_dice_surface(self, value):
         """Create a dice surface with the given value"""
@@ -125,9 +122,15 @@ class Dice:
                 self.value = random.randint(1, 6)
         return False
     
+    def get_dice_surface(self, value):
+        """Return the cached surface for a face, creating it on first use"""
+        surface = self.surfaces.get(value)
+        if surface is None:
+            surface = self.surfaces[value] = self.create_dice_surface(value)
+        return surface
+    
     def draw(self, screen, x, y):
-        dice_surface = self.create_dice_surface(self.value)
-        screen.blit(dice_surface, (x, y))
+        screen.blit(self.get_dice_surface(self.value), (x, y))
 
 class Game:
     def __init__(self):
@@ -0,0 +1,60 @@
+"""Background providers and a cache of rendered backgrounds.
+
+A provider describes a vertical gradient as one RGB row per scanline. The
+rows are expanded to a full surface with pygame.surfarray in one call and
+the result is cached by (provider key, size), so resets and repeated window
+sizes never rebuild a background. Themes can supply their own provider.
+"""
+import numpy as np
+import pygame
+
+_cache = {}
+
+
+class DefaultGradient:
+    """The original light blue gradient, one shade darker every 8 pixels"""
+
+    top = (200, 230, 255)
+
+    def key(self):
+        return ("default",)
+
+    def colors(self, height):
+        rows = np.arange(height)[:, None] // 8
+        return np.array(self.top)[None, :] - rows
+
+
+class LinearGradient:
+    """Linear blend from a top color to a bottom color"""
+
+    def __init__(self, top, bottom):
+        self.top = tuple(top)
+        self.bottom = tuple(bottom)
+
+    def key(self):
+        return ("linear", self.top, self.bottom)
+
+    def colors(self, height):
+        t = np.linspace(0.0, 1.0, height)[:, None]
+        top = np.array(self.top, dtype=float)
+        bottom = np.array(self.bottom, dtype=float)
+        return np.rint(top + (bottom - top) * t)
+
+
+def render_background(provider, size):
+    """Render a provider's gradient to a new surface of the given size"""
+    width, height = size
+    rows = np.clip(provider.colors(height), 0, 255).astype(np.uint8)
+    surf = pygame.Surface(size)
+    # surfarray uses (x, y) indexing, so broadcast the rows across every column
+    pygame.surfarray.blit_array(surf, np.broadcast_to(rows[None, :, :], (width, height, 3)))
+    return surf
+
+
+def get_background(provider, size):
+    """Return the cached background for provider at size"""
+    key = (provider.key(), tuple(size))
+    surf = _cache.get(key)
+    if surf is None:
+        surf = _cache[key] = render_background(provider, size)
+    return surf
@@ -0,0 +1,138 @@
+"""NumPy batch simulator that advances many games in lockstep.
+
+Positions for N games x P players are held in one array. Every step rolls
+the dice for all unfinished games with a single RNG call, applies the
+bounce rule and a precomputed jump table with fancy indexing, and retires
+finished games with a mask. Results match engine.Engine game for game in
+distribution.
+"""
+import sys
+import time
+
+import numpy as np
+
+from board import load_board
+from engine import Engine
+
+
+def jump_table(engine):
+    """The engine board's compiled jump array as a NumPy array"""
+    return np.array(engine.board.jumps, dtype=np.int32)
+
+
+class BatchResult:
+    """Per-game outcome arrays for a batch of simulated games"""
+
+    def __init__(self, winners, turns, snake_hits, ladder_hits, bounces, num_players):
+        self.winners = winners
+        self.turns = turns
+        self.snake_hits = snake_hits
+        self.ladder_hits = ladder_hits
+        self.bounces = bounces
+        self.num_players = num_players
+
+    def __len__(self):
+        return len(self.winners)
+
+    @classmethod
+    def concatenate(cls, results):
+        """Join several results for the same number of players"""
+        results = list(results)
+        return cls(
+            np.concatenate([r.winners for r in results]),
+            np.concatenate([r.turns for r in results]),
+            np.concatenate([r.snake_hits for r in results]),
+            np.concatenate([r.ladder_hits for r in results]),
+            np.concatenate([r.bounces for r in results]),
+            results[0].num_players,
+        )
+
+    def win_rates(self):
+        """Fraction of games won by each seat"""
+        counts = np.bincount(self.winners, minlength=self.num_players)
+        return counts / max(1, len(self))
+
+    def turn_histogram(self):
+        """Number of games that lasted exactly t total rolls, indexed by t"""
+        return np.bincount(self.turns)
+
+    def summary(self):
+        """Headline statistics as a plain dict"""
+        return {
+            "games": len(self),
+            "win_rates": self.win_rates().tolist(),
+            "mean_turns": float(self.turns.mean()),
+            "std_turns": float(self.turns.std()),
+            "mean_snake_hits": float(self.snake_hits.mean()),
+            "mean_ladder_hits": float(self.ladder_hits.mean()),
+            "mean_bounces": float(self.bounces.mean()),
+        }
+
+
+def simulate_chunk(num_games, num_players, rng, engine, jump):
+    """Play num_games games to completion in lockstep"""
+    win_cell = engine.win_cell
+    positions = np.zeros((num_games, num_players), dtype=np.int32)
+    winners = np.zeros(num_games, dtype=np.int8)
+    turns = np.zeros(num_games, dtype=np.int32)
+    snake_hits = np.zeros(num_games, dtype=np.int16)
+    ladder_hits = np.zeros(num_games, dtype=np.int16)
+    bounces = np.zeros(num_games, dtype=np.int16)
+
+    # Every game starts with seat 0, so all active games share the same seat
+    active = np.arange(num_games)
+    seat = 0
+    while len(active):
+        rolls = rng.integers(1, engine.sides + 1, size=len(active), dtype=np.int32)
+        landed = positions[active, seat] + rolls
+
+        # Bounce back off the win cell
+        overshoot = landed > win_cell
+        landed = np.where(overshoot, 2 * win_cell - landed, landed)
+        new_pos = jump[landed]
+
+        positions[active, seat] = new_pos
+        turns[active] += 1
+        snake_hits[active] += new_pos < landed
+        ladder_hits[active] += new_pos > landed
+        bounces[active] += overshoot
+
+        # Retire finished games
+        finished = new_pos == win_cell
+        winners[active[finished]] = seat
+        active = active[~finished]
+        seat = (seat + 1) % num_players
+
+    return BatchResult(winners, turns, snake_hits, ladder_hits, bounces, num_players)
+
+
+def simulate_batch(num_games, num_players=2, seed=None, engine=None, chunk_size=1_000_000):
+    """Simulate num_games games, chunk_size at a time, and return a BatchResult"""
+    if num_games < 1:
+        raise ValueError(f"num_games must be at least 1, got {num_games}")
+    if engine is None:
+        engine = Engine()
+    rng = np.random.default_rng(seed)
+    jump = jump_table(engine)
+
+    chunks = []
+    remaining = num_games
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunks.append(simulate_chunk(size, num_players, rng, engine, jump))
+        remaining -= size
+    return BatchResult.concatenate(chunks)
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    num_players = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    engine = Engine(load_board(sys.argv[3])) if len(sys.argv) > 3 else None
+
+    start = time.perf_counter()
+    result = simulate_batch(num_games, num_players, seed=0, engine=engine)
+    elapsed = time.perf_counter() - start
+
+    print(f"{num_games} games in {elapsed:.2f}s ({num_games / elapsed * 60:,.0f} games/min)")
+    for key, value in result.summary().items():
+        print(f"{key}: {value}")
@@ -0,0 +1,63 @@
+"""Time-to-first-frame for a brand new game versus a rematch.
+
+Run from the repository root:
+
+    python benchmarks/bench_reset.py [repeats]
+
+Uses SDL's dummy video driver unless SDL_VIDEODRIVER is already set.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+
+
+def first_frame(game):
+    game.draw_board()
+
+
+def time_new_game():
+    start = time.perf_counter()
+    game = main.Game()
+    first_frame(game)
+    return time.perf_counter() - start, game
+
+
+def time_rematch(game):
+    start = time.perf_counter()
+    game.reset()
+    first_frame(game)
+    return time.perf_counter() - start
+
+
+def time_reinit(game):
+    """The old reset path, which re-ran Game.__init__"""
+    start = time.perf_counter()
+    game.__init__()
+    first_frame(game)
+    return time.perf_counter() - start
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    median = samples[len(samples) // 2]
+    print(f"{label:<12} median {median * 1000:8.3f} ms   best {samples[0] * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    new_game, rematch, reinit = [], [], []
+    for _ in range(repeats):
+        elapsed, game = time_new_game()
+        new_game.append(elapsed)
+        rematch.append(time_rematch(game))
+        reinit.append(time_reinit(game))
+
+    report("new game", new_game)
+    report("re-init", reinit)
+    report("rematch", rematch)
@@ -0,0 +1,152 @@
+"""Turn latency, CPU cost and per-room memory of the asyncio game server.
+
+Runs a GameServer in a child process, connects two local socket clients per
+room and plays every room to completion, timing each roll from request to
+the roller receiving its turn delta. Players wait `interval` seconds between
+rolls, as the dice animation makes real players do; an interval of 0 floods
+the server instead and measures queueing rather than latency.
+
+The server reports its own CPU time per turn, which gives the number of
+rooms one core sustains at one roll per second, and its traced memory per
+seated room.
+
+    python benchmarks/bench_server.py [rooms] [games_per_room] [interval]
+
+Every room needs two sockets on each side, so large room counts may need a
+higher open file limit (ulimit -n).
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import Client, GameServer  # noqa: E402
+
+# Rooms allowed to be connecting at the same time
+CONNECT_BATCH = 100
+
+
+def run_server(conn):
+    """Child process: serve until told to stop, answering stats requests"""
+    async def serve():
+        tracemalloc.start()
+        server = GameServer(seed=0)
+        listener = await server.start(port=0)
+        baseline = tracemalloc.get_traced_memory()[0]
+        start_cpu = time.process_time()
+        stopped = asyncio.Event()
+
+        def command():
+            request = conn.recv()
+            if request == "memory":
+                used = tracemalloc.get_traced_memory()[0] - baseline
+                conn.send((used, len(server.rooms)))
+            elif request == "reset-cpu":
+                nonlocal start_cpu
+                start_cpu = time.process_time()
+                conn.send(None)
+            else:
+                conn.send(time.process_time() - start_cpu)
+                stopped.set()
+
+        asyncio.get_running_loop().add_reader(conn.fileno(), command)
+        conn.send(listener.sockets[0].getsockname()[1])
+        await stopped.wait()
+        listener.close()
+
+    asyncio.run(serve())
+
+
+async def connect_room(name, port, connecting):
+    # Bursts of connects beyond the kernel's SYN backlog get dropped and retried
+    async with connecting:
+        clients = [await Client.connect(port=port) for _ in range(2)]
+        for client in clients:
+            client.send(op="join", room=name, players=2)
+        for client in clients:
+            await client.receive_type("start")
+    return clients
+
+
+async def play_room(name, port, games, interval, latencies, connecting):
+    clients = await connect_room(name, port, connecting)
+    for game in range(games):
+        seat = 0
+        while True:
+            if interval:
+                await asyncio.sleep(interval * (0.5 + random.random()))
+            start = time.perf_counter()
+            clients[seat].send(op="roll")
+            delta = await clients[seat].receive_type("turn")
+            latencies.append(time.perf_counter() - start)
+            # The other player sees the same delta
+            await clients[1 - seat].receive_type("turn")
+            if "winner" in delta:
+                break
+            seat = delta["next"]
+        if game + 1 < games:
+            clients[0].send(op="rematch")
+            for client in clients:
+                await client.receive_type("start")
+
+    for client in clients:
+        await client.close()
+
+
+async def request(conn, message):
+    conn.send(message)
+    return await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+
+async def main(conn, port, rooms, games, interval):
+    connecting = asyncio.Semaphore(CONNECT_BATCH)
+
+    # Seat a batch of idle rooms to measure server memory per room
+    idle = await asyncio.gather(*(connect_room(f"idle-{i}", port, connecting)
+                                  for i in range(min(rooms, 1000))))
+    used, open_rooms = await request(conn, "memory")
+    for clients in idle:
+        for client in clients:
+            await client.close()
+
+    await request(conn, "reset-cpu")
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(play_room(f"room-{i}", port, games, interval, latencies, connecting)
+                           for i in range(rooms)))
+    elapsed = time.perf_counter() - start
+    server_cpu = await request(conn, "stop")
+
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    turns = len(latencies)
+    per_turn = server_cpu / turns
+    print(f"{rooms} rooms, {turns} turns in {elapsed:.2f}s ({turns / elapsed:,.0f} turns/s)")
+    print(f"turn latency p50 {percentile(0.50):.3f} ms, p99 {percentile(0.99):.3f} ms,"
+          f" max {latencies[-1] * 1000:.3f} ms")
+    print(f"server CPU {per_turn * 1e6:.1f} us/turn"
+          f" ({1 / per_turn:,.0f} rooms per core at one roll per second)")
+    print(f"server memory {used / open_rooms / 1024:.1f} KiB per seated room")
+
+
+if __name__ == "__main__":
+    rooms = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    interval = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=run_server, args=(child_conn,), daemon=True)
+    server.start()
+    port = conn.recv()
+    try:
+        asyncio.run(main(conn, port, rooms, games, interval))
+    finally:
+        server.join(5)
@@ -0,0 +1,91 @@
+"""Memory per live game for plain objects, GameState, packed bytes and GameTable.
+
+Creates the given number of two-player games in each representation (one
+at a time) and reports traced memory per game, plus pack/unpack speed and
+the time to advance every game in a GameTable by one roll.
+
+    python benchmarks/bench_state.py [games]
+"""
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import Engine, roll_die  # noqa: E402
+from batch import jump_table  # noqa: E402
+from state import GameState, GameTable  # noqa: E402
+
+
+class PlainState:
+    """The same fields in an ordinary instance dict with a list of positions"""
+
+    def __init__(self, num_players=2, seed=0):
+        self.seed = seed
+        self.turn = 0
+        self.seat = 0
+        self.winner = None
+        self.positions = [0] * num_players
+
+
+def played(games):
+    """GameStates a few turns into their games"""
+    engine = Engine()
+    rng = random.Random(0)
+    for index in range(games):
+        state = GameState(2, index)
+        for _ in range(rng.randint(0, 20)):
+            state.move(engine, roll_die(rng))
+            if state.winner is not None:
+                break
+        yield state
+
+
+def measure(label, build, games):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    live = build(games)
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<16} {used / games:7.1f} bytes/game"
+          f" ({used / 2**20:8.1f} MiB for {games:,} games, built in {elapsed:.2f}s)")
+    return live
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    measure("plain objects", lambda n: [PlainState(2, i) for i in range(n)], games)
+    measure("slotted state", lambda n: [GameState(2, i) for i in range(n)], games)
+    packed = measure("packed bytes", lambda n: [state.pack() for state in played(n)], games)
+
+    def fill_table(n):
+        table = GameTable(n)
+        for index in range(n):
+            table.add(index)
+        return table
+
+    table = measure("game table", fill_table, games)
+    jump = jump_table(Engine())
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    table.step(jump, rng)
+    step_time = time.perf_counter() - start
+    print(f"game table step: {step_time * 1000:.1f} ms to roll once in {len(table):,} games")
+
+    start = time.perf_counter()
+    states = [GameState.unpack(data) for data in packed]
+    unpack_time = time.perf_counter() - start
+    start = time.perf_counter()
+    repacked = [state.pack() for state in states]
+    pack_time = time.perf_counter() - start
+    assert repacked == packed
+    print(f"pack {pack_time / games * 1e6:.2f} us, unpack {unpack_time / games * 1e6:.2f} us,"
+          f" {len(packed[0])} bytes per two-player game")
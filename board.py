@@ -0,0 +1,264 @@
+"""Board definitions: loading, validation and compilation.
+
+A board is a number of cells (the last one wins), a grid width used for
+layout, and snakes and ladders given as start -> end cell mappings. At load
+time every board is validated and compiled into a dense jump array, where
+jumps[cell] is the cell a player landing on `cell` ends up on, and hashed so
+derived caches (rendered board surfaces, Markov statistics) can be keyed on
+its content. Boards that cannot be won from the start cell are rejected.
+
+Board files are JSON or TOML:
+
+    {"name": "classic", "size": 100, "columns": 10,
+     "snakes": {"16": 6, "47": 26}, "ladders": {"1": 38, "4": 14}}
+
+Snakes and ladders may also be given as lists of [start, end] pairs.
+"""
+import hashlib
+import json
+import math
+import os
+import random
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python < 3.11
+    tomllib = None
+
+# Die the win cell must be reachable with; engine.Engine checks other dice
+DICE_SIDES = 6
+
+# The classic board ships as a board file like any other
+CLASSIC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "boards", "classic.json")
+
+
+class BoardError(ValueError):
+    """Raised for board definitions that cannot be played"""
+
+
+def _pairs(value, kind):
+    """Normalize a mapping or list of pairs to an {int: int} dict"""
+    if isinstance(value, dict):
+        items = value.items()
+    else:
+        items = value
+    result = {}
+    for start, end in items:
+        start, end = int(start), int(end)
+        if start in result:
+            raise BoardError(f"{kind} at {start} is defined twice")
+        result[start] = end
+    return result
+
+
+class Board:
+    def __init__(self, snakes=(), ladders=(), size=100, columns=10, name="custom"):
+        self.name = name
+        self.size = int(size)
+        self.columns = int(columns)
+        self.snakes = _pairs(snakes, "snake")
+        self.ladders = _pairs(ladders, "ladder")
+        self.validate()
+
+        self.rows = math.ceil(self.size / self.columns)
+        self.jumps = self.compile()
+        self.check_playable()
+        self.hash = self.compute_hash()
+
+    def __repr__(self):
+        return (f"Board({self.name!r}, size={self.size}, columns={self.columns}, "
+                f"snakes={len(self.snakes)}, ladders={len(self.ladders)})")
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.hash == other.hash
+
+    def __hash__(self):
+        return hash(self.hash)
+
+    @property
+    def win_cell(self):
+        return self.size
+
+    def validate(self):
+        """Reject boards with bad cells, overlapping endpoints, chains or cycles"""
+        if self.size < 2:
+            raise BoardError("a board needs at least two cells")
+        if self.columns < 1:
+            raise BoardError("a board needs at least one column")
+
+        for kind, jumps, climbs in (("snake", self.snakes, False), ("ladder", self.ladders, True)):
+            for start, end in jumps.items():
+                if not 1 <= start < self.size:
+                    raise BoardError(f"{kind} starts outside the board at {start}")
+                if not 1 <= end <= self.size:
+                    raise BoardError(f"{kind} at {start} ends outside the board at {end}")
+                if climbs and end <= start:
+                    raise BoardError(f"ladder at {start} does not go up (ends at {end})")
+                if not climbs and end >= start:
+                    raise BoardError(f"snake at {start} does not go down (ends at {end})")
+
+        overlap = self.snakes.keys() & self.ladders.keys()
+        if overlap:
+            raise BoardError(f"cells {sorted(overlap)} start both a snake and a ladder")
+
+        # Follow every jump; landing on another start is a chain, returning is a cycle
+        starts = {**self.ladders, **self.snakes}
+        for start in starts:
+            seen = [start]
+            cell = starts[start]
+            while cell in starts:
+                if cell in seen:
+                    path = " -> ".join(map(str, seen + [cell]))
+                    raise BoardError(f"jumps form a cycle: {path}")
+                seen.append(cell)
+                cell = starts[cell]
+            if len(seen) > 1:
+                path = " -> ".join(map(str, seen + [cell]))
+                raise BoardError(f"jumps chain into each other: {path}")
+
+    def check_playable(self, sides=DICE_SIDES):
+        """Reject boards a player could fail to finish with a die of `sides`
+
+        Every cell reachable from the start must itself be able to reach the
+        win cell; otherwise a player landing there is stuck for good.
+        """
+        # Bouncing back off a board no longer than the die could land below 0
+        if self.size <= sides:
+            raise BoardError(f"a board for a {sides}-sided die needs more than {sides} cells")
+
+        # Search every cell a player can stand on, starting from 0, noting
+        # where each one can be entered from
+        size = self.size
+        jumps = self.jumps
+        sources = {0: []}
+        frontier = [0]
+        while frontier:
+            cell = frontier.pop()
+            if cell == size:
+                continue
+            for roll in range(1, sides + 1):
+                landed = cell + roll
+                if landed > size:
+                    landed = size - (landed - size)
+                destination = jumps[landed]
+                if destination not in sources:
+                    sources[destination] = []
+                    frontier.append(destination)
+                sources[destination].append(cell)
+        if size not in sources:
+            raise BoardError(f"the win cell {size} cannot be reached from the start")
+
+        # Search backwards from the win cell over the same moves
+        finishes = {size}
+        frontier = [size]
+        while frontier:
+            for cell in sources[frontier.pop()]:
+                if cell not in finishes:
+                    finishes.add(cell)
+                    frontier.append(cell)
+        stuck = sorted(sources.keys() - finishes)
+        if stuck:
+            shown = ", ".join(map(str, stuck[:10])) + (", ..." if len(stuck) > 10 else "")
+            raise BoardError(f"players landing on cells {shown} can never finish")
+
+    def compile(self):
+        """Dense cell -> destination list covering cells 0..size"""
+        jumps = list(range(self.size + 1))
+        for start, end in self.ladders.items():
+            jumps[start] = end
+        # Snakes are written last so they take precedence, as in Game.update
+        for start, end in self.snakes.items():
+            jumps[start] = end
+        return jumps
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "size": self.size,
+            "columns": self.columns,
+            "snakes": {str(k): v for k, v in sorted(self.snakes.items())},
+            "ladders": {str(k): v for k, v in sorted(self.ladders.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            snakes=data.get("snakes", {}),
+            ladders=data.get("ladders", {}),
+            size=data.get("size", 100),
+            columns=data.get("columns", 10),
+            name=data.get("name", "custom"),
+        )
+
+    def compute_hash(self):
+        """Content hash; the name is cosmetic and not part of it"""
+        canonical = json.dumps(
+            [self.size, self.columns, sorted(self.snakes.items()), sorted(self.ladders.items())],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def load_board(path):
+    """Load, validate and compile a JSON or TOML board file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        if tomllib is None:
+            raise BoardError("TOML boards need Python 3.11 or newer")
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+
+    data.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    return Board.from_dict(data)
+
+
+def random_board(size, columns, num_snakes, num_ladders, seed=None, name="random",
+                 max_length=None):
+    """Generate a valid board with the given numbers of snakes and ladders
+
+    Snakes and ladders span at most max_length cells, three rows by default.
+    """
+    if max_length is None:
+        max_length = 3 * columns
+    rng = random.Random(seed)
+    # Every endpoint is distinct, which rules out overlaps, chains and cycles
+    used = {size}
+    snakes, ladders = {}, {}
+
+    def pick(low, high):
+        for _ in range(1000):
+            cell = rng.randint(low, high)
+            if cell not in used:
+                used.add(cell)
+                return cell
+        raise BoardError(f"board of {size} cells is too crowded")
+
+    for _ in range(num_snakes):
+        start = pick(3, size - 1)
+        snakes[start] = pick(max(1, start - max_length), start - 1)
+    for _ in range(num_ladders):
+        start = pick(1, size - 2)
+        ladders[start] = pick(start + 1, min(size - 1, start + max_length))
+    return Board(snakes, ladders, size, columns, name)
+
+
+DEFAULT_BOARD = load_board(CLASSIC_PATH)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 6:
+        sys.exit("usage: python board.py SIZE COLUMNS SNAKES LADDERS OUTPUT [SEED]")
+    size, columns, num_snakes, num_ladders = map(int, sys.argv[1:5])
+    seed = int(sys.argv[6]) if len(sys.argv) > 6 else None
+    board = random_board(size, columns, num_snakes, num_ladders, seed)
+    board.save(sys.argv[5])
+    print(board)
@@ -0,0 +1,148 @@
+"""Headless rules engine for Snake and Ladders.
+
+Plays complete games with exactly the same rules as main.py (bounce back
+past the last cell, snakes checked before ladders, win on the last cell)
+but without pygame, timers or animation, so it can be used for bulk
+simulation. Boards come from board.py in compiled form.
+"""
+import random
+import sys
+import time
+from collections import namedtuple
+
+from board import DEFAULT_BOARD, DICE_SIDES, load_board
+
+WIN_CELL = DEFAULT_BOARD.size
+
+# What happened on the landing cell of a move
+HIT_NONE = 0
+HIT_SNAKE = 1
+HIT_LADDER = 2
+
+GameResult = namedtuple(
+    "GameResult", ["winner", "turns", "snake_hits", "ladder_hits", "bounces"]
+)
+GameResult.__doc__ = """Outcome of one complete game.
+
+winner is the zero-based seat that reached the win cell, turns is the total
+number of rolls taken by all players, and the hit counters are summed over
+all players.
+"""
+
+
+def land(position, roll, win_cell=WIN_CELL):
+    """Apply a roll, bouncing back off the win cell if it overshoots"""
+    new_pos = position + roll
+    if new_pos > win_cell:
+        new_pos = win_cell - (new_pos - win_cell)
+    return new_pos
+
+
+def roll_die(rng, sides=DICE_SIDES):
+    """Roll one fair die using the given random.Random instance"""
+    return int(rng.random() * sides) + 1
+
+
+class Engine:
+    def __init__(self, board=DEFAULT_BOARD, sides=DICE_SIDES):
+        self.board = board
+        self.win_cell = board.size
+        self.sides = sides
+        # Boards are checked for the standard die when they are built
+        if sides != DICE_SIDES:
+            board.check_playable(sides)
+        self.build_tables()
+
+    @property
+    def snakes(self):
+        return self.board.snakes
+
+    @property
+    def ladders(self):
+        return self.board.ladders
+
+    def build_tables(self):
+        """Precompute destination and hit type for every (cell, roll) pair"""
+        stride = self.sides + 1
+        jumps = self.board.jumps
+        self.destinations = [0] * ((self.win_cell + 1) * stride)
+        self.hits = [HIT_NONE] * len(self.destinations)
+        self.bounced = [False] * len(self.destinations)
+
+        for position in range(self.win_cell + 1):
+            for roll in range(1, self.sides + 1):
+                index = position * stride + roll
+                landed = land(position, roll, self.win_cell)
+                self.bounced[index] = position + roll > self.win_cell
+
+                # The compiled jump array already applies snake precedence
+                new_pos = jumps[landed]
+                if new_pos < landed:
+                    self.hits[index] = HIT_SNAKE
+                elif new_pos > landed:
+                    self.hits[index] = HIT_LADDER
+
+                self.destinations[index] = new_pos
+
+    def resolve(self, position, roll):
+        """Return (new_position, hit, bounced) for a single roll"""
+        index = position * (self.sides + 1) + roll
+        return self.destinations[index], self.hits[index], self.bounced[index]
+
+    def move(self, position, roll):
+        """Return the cell a player on position ends up on after roll"""
+        return self.destinations[position * (self.sides + 1) + roll]
+
+    def play(self, num_players=2, rng=None):
+        """Play one complete game and return its GameResult"""
+        if rng is None:
+            rng = random.Random()
+
+        # Local lookups keep the inner loop tight
+        random_ = rng.random
+        sides = self.sides
+        stride = sides + 1
+        destinations = self.destinations
+        hits = self.hits
+        bounced = self.bounced
+        win_cell = self.win_cell
+
+        positions = [0] * num_players
+        hit_counts = [0, 0, 0]
+        bounces = 0
+        turns = 0
+        seat = 0
+        while True:
+            index = positions[seat] * stride + int(random_() * sides) + 1
+            new_pos = destinations[index]
+            hit_counts[hits[index]] += 1
+            bounces += bounced[index]
+            turns += 1
+            positions[seat] = new_pos
+            if new_pos == win_cell:
+                return GameResult(seat, turns, hit_counts[HIT_SNAKE], hit_counts[HIT_LADDER], bounces)
+            seat += 1
+            if seat == num_players:
+                seat = 0
+
+    def simulate(self, num_games, num_players=2, seed=None):
+        """Yield the results of num_games independent games"""
+        rng = random.Random(seed)
+        for _ in range(num_games):
+            yield self.play(num_players, rng)
+
+
+if __name__ == "__main__":
+    num_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    engine = Engine(load_board(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BOARD)
+    wins = [0, 0]
+    total_turns = 0
+    start = time.perf_counter()
+    for result in engine.simulate(num_games, 2, seed=0):
+        wins[result.winner] += 1
+        total_turns += result.turns
+    elapsed = time.perf_counter() - start
+
+    print(f"{num_games} games in {elapsed:.2f}s ({num_games / elapsed * 60:,.0f} games/min)")
+    print(f"Mean turns: {total_turns / num_games:.2f}")
+    print(f"Win rates: {', '.join(f'{w / num_games:.3f}' for w in wins)}")
@@ -0,0 +1,152 @@
+"""Multi-process simulation farm with deterministic seeding.
+
+The requested game count is cut into fixed-size shards. Every shard gets
+its own seed derived from the master seed and the shard index, so the
+merged histograms depend only on the master seed and shard size, never on
+the number of worker processes or the order shards finish in.
+"""
+import hashlib
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from board import DEFAULT_BOARD, load_board
+from engine import Engine
+
+DEFAULT_SHARD_SIZE = 10000
+
+# Engine instance for the current worker process, built once by init_worker
+_worker_engine = None
+
+
+def shard_seed(master_seed, shard_index):
+    """Derive an independent 64-bit seed for one shard"""
+    digest = hashlib.sha256(f"{master_seed}:{shard_index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+class Histograms:
+    """Mergeable counters collected over many games"""
+
+    def __init__(self):
+        self.games = 0
+        self.turns = Counter()
+        self.snake_hits = Counter()
+        self.ladder_hits = Counter()
+        self.bounces = Counter()
+        self.winners = Counter()
+
+    def add(self, result):
+        """Record one engine.GameResult"""
+        self.games += 1
+        self.turns[result.turns] += 1
+        self.snake_hits[result.snake_hits] += 1
+        self.ladder_hits[result.ladder_hits] += 1
+        self.bounces[result.bounces] += 1
+        self.winners[result.winner] += 1
+
+    def merge(self, other):
+        """Fold another Histograms into this one and return self"""
+        self.games += other.games
+        self.turns.update(other.turns)
+        self.snake_hits.update(other.snake_hits)
+        self.ladder_hits.update(other.ladder_hits)
+        self.bounces.update(other.bounces)
+        self.winners.update(other.winners)
+        return self
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Histograms)
+            and self.games == other.games
+            and self.turns == other.turns
+            and self.snake_hits == other.snake_hits
+            and self.ladder_hits == other.ladder_hits
+            and self.bounces == other.bounces
+            and self.winners == other.winners
+        )
+
+    def mean_turns(self):
+        return sum(t * n for t, n in self.turns.items()) / max(1, self.games)
+
+    def win_rates(self, num_players):
+        return [self.winners[seat] / max(1, self.games) for seat in range(num_players)]
+
+
+def init_worker(board, sides):
+    """Build the worker's engine once instead of once per shard"""
+    global _worker_engine
+    _worker_engine = Engine(board, sides)
+
+
+def run_shard(args):
+    """Play one shard of games and return its histograms"""
+    master_seed, shard_index, num_games, num_players = args
+    engine = _worker_engine
+    rng = random.Random(shard_seed(master_seed, shard_index))
+
+    histograms = Histograms()
+    for _ in range(num_games):
+        histograms.add(engine.play(num_players, rng))
+    return histograms
+
+
+def run_farm(num_games, num_players=2, master_seed=0, workers=None,
+             shard_size=DEFAULT_SHARD_SIZE, engine=None):
+    """Simulate num_games games across a process pool and merge the results"""
+    if engine is None:
+        engine = Engine()
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    shards = []
+    for shard_index, start in enumerate(range(0, num_games, shard_size)):
+        size = min(shard_size, num_games - start)
+        shards.append((master_seed, shard_index, size, num_players))
+
+    init_args = (engine.board, engine.sides)
+    histograms = Histograms()
+    if workers == 1:
+        init_worker(*init_args)
+        for shard in shards:
+            histograms.merge(run_shard(shard))
+        return histograms
+
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=init_args) as pool:
+        for result in pool.map(run_shard, shards):
+            histograms.merge(result)
+    return histograms
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    options = {}
+    for flag in ("--stats", "--board", "--players"):
+        if flag in args:
+            index = args.index(flag)
+            options[flag] = args[index + 1]
+            del args[index:index + 2]
+    stats_path = options.get("--stats")
+    board = load_board(options["--board"]) if "--board" in options else DEFAULT_BOARD
+    num_players = int(options.get("--players", 2))
+    num_games = int(args[0]) if len(args) > 0 else 1000000
+    workers = int(args[1]) if len(args) > 1 else None
+
+    start = time.perf_counter()
+    histograms = run_farm(num_games, num_players, workers=workers, engine=Engine(board))
+    elapsed = time.perf_counter() - start
+
+    print(f"{num_games} games in {elapsed:.2f}s ({num_games / elapsed * 60:,.0f} games/min)")
+    print(f"Mean turns: {histograms.mean_turns():.2f}")
+    print(f"Win rates: {', '.join(f'{r:.4f}' for r in histograms.win_rates(num_players))}")
+
+    if stats_path is not None:
+        # Imported here because stats builds on this module's Histograms
+        from stats import StatsStore
+        store = StatsStore(stats_path)
+        store.record_histograms(histograms, board, num_players)
+        store.close()
+        print(f"Aggregates added to {stats_path}")
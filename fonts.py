@@ -0,0 +1,66 @@
+"""Shared font registry and rendered-text cache.
+
+Looking up a SysFont and rendering the same string every frame is
+surprisingly expensive, so fonts are created once per (name, size, style)
+and rendered text surfaces are kept in an LRU cache keyed by
+(font, text, color). Cached surfaces are shared and must not be drawn on.
+"""
+import time
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}
+
+
+def get_font(name, size, bold=False, italic=False):
+    """Return the shared SysFont for the given name, size and style"""
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces with hit/miss counters"""
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.render_time = 0.0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        start = time.perf_counter()
+        surface = font.render(text, antialias, color)
+        self.render_time += time.perf_counter() - start
+
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color):
+    """Render antialiased text through the shared cache"""
+    return text_cache.render(font, text, color)
@@ -2,18 +2,44 @@ import pygame
 import random
 import sys
 import math
+import os
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backgrounds import DefaultGradient, get_background
+from board import DEFAULT_BOARD, load_board
+from engine import HIT_LADDER, HIT_NONE, HIT_SNAKE, Engine, GameResult, land
+from fonts import get_font, render_text, text_cache
+from particles import ParticleSystem
+from profiler import FrameProfiler
+from replay import GameLog
+from stats import StatsStore
+from timestep import FixedTimestep, STEP
+from variants import Rules, choose_move, init_worker
+from viewport import Camera, SpatialIndex
 
 # Initialize pygame
 pygame.init()
 
 # Constants
 WIDTH, HEIGHT = 1000, 800
-GRID_SIZE = 10
 CELL_SIZE = 70
 BOARD_MARGIN = 50
+# World-space tile size for caching scrolling boards
+CHUNK_SIZE = 512
 FPS = 60
 
+# Animation speeds, per fixed simulation step
+MOVE_SPEED = 0.05
+# Snakes and ladders are ridden along a track of TRACK_SAMPLES segments,
+# each taking 1 / TRACK_SPEED steps, however far they go
+TRACK_SAMPLES = 16
+TRACK_SPEED = 0.25
+ROLL_SPIN = 30
+ROLL_DURATION = 1.0
+
 # Colors (RGB tuples only)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -31,145 +57,215 @@ DARK_GREEN = (0, 100, 0)
 GOLD = (255, 215, 0)
 SILVER = (192, 192, 192)
 BOARD_BG = (240, 240, 240)
+# Transparent color for off-board parts of board chunks
+CHUNK_KEY = (255, 0, 254)
 GRID_COLOR1 = (255, 250, 240)
 GRID_COLOR2 = (245, 245, 245)
 
-# Define snakes and ladders
-snakes = {
-    16: 6, 47: 26, 49: 11, 56: 53, 62: 19, 
-    64: 60, 87: 24, 93: 73, 95: 75, 98: 78
-}
+# Player colors in seat order; seats beyond the list get generated hues
+PLAYER_COLORS = [RED, BLUE, GREEN, ORANGE, PURPLE, BROWN, DARK_GREEN, (0, 150, 160)]
+MAX_PLAYERS = 64
+# Player status lines that fit in the info panel
+STATUS_LINES = 5
+# Statistics dashboard above the info panel, and its game length bars
+STATS_PANEL = (WIDTH - 300, HEIGHT - 390, 280, 180)
+STATS_BINS = 14
 
-ladders = {
-    1: 38, 4: 14, 9: 31, 21: 42, 28: 84, 
-    36: 44, 51: 67, 71: 91, 80: 100
-}
+# Token offsets and radius for a number of tokens sharing a cell, see token_layout
+_token_layouts = {}
+
+
+def player_color(seat):
+    """Distinct color for a zero-based seat"""
+    if seat < len(PLAYER_COLORS):
+        return PLAYER_COLORS[seat]
+    color = pygame.Color(0)
+    # Golden-angle hue steps keep neighbouring seats apart
+    color.hsva = ((seat * 137.508) % 360, 75, 80, 100)
+    return tuple(color)[:3]
+
+
+def token_layout(count):
+    """Offsets from the cell center and token radius for count tokens on one cell"""
+    layout = _token_layouts.get(count)
+    if layout is not None:
+        return layout
+    
+    if count <= 4:
+        # First token centered, the rest in 90 degree steps around it
+        offsets = [(0, 0)]
+        for i in range(1, count):
+            angle = (i * 90) * (3.14159 / 180)
+            offsets.append((math.cos(angle) * 15, math.sin(angle) * 15))
+        radius = CELL_SIZE // 3
+    else:
+        # Shrink tokens onto a square grid that fits inside the cell
+        side = math.ceil(math.sqrt(count))
+        spacing = CELL_SIZE * 0.9 / side
+        offsets = [((i % side - (side - 1) / 2) * spacing, (i // side - (side - 1) / 2) * spacing)
+                   for i in range(count)]
+        # Neighbours may overlap slightly so small tokens stay readable
+        radius = max(3, int(spacing * 0.55))
+    
+    layout = _token_layouts[count] = (offsets, radius)
+    return layout
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(2, 5)
-        self.speed_x = random.uniform(-3, 3)
-        self.speed_y = random.uniform(-3, 3)
-        self.life = random.uniform(0.5, 1.5)
-        
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.life -= 0.03
-        self.size -= 0.1
-        return self.life > 0 and self.size > 0
-        
-    def draw(self, screen):
-        alpha = min(255, max(0, int(255 * self.life)))
-        # Create surface with alpha channel
-        surf = pygame.Surface((int(self.size * 2), int(self.size * 2)), pygame.SRCALPHA)
-        # Use the original color but adjust brightness based on life
-        r, g, b = self.color
-        adjusted_color = (r, g, b, alpha)
-        pygame.draw.circle(surf, adjusted_color, (int(self.size), int(self.size)), int(self.size))
-        screen.blit(surf, (int(self.x - self.size), int(self.y - self.size)))
 
 class Player:
-    def __init__(self, number, color, name):
+    __slots__ = ("number", "color", "name", "particles", "sprites", "position", "won",
+                 "target_position", "moving", "move_progress", "move_path", "current_move_index",
+                 "track", "track_index")
+    is_ai = False
+    
+    def __init__(self, number, color, name, particles):
         self.number = number
         self.color = color
         self.name = name
+        # Shared ParticleSystem owned by the game
+        self.particles = particles
+        # Token surfaces keyed by radius, see sprite
+        self.sprites = {}
+        self.reset()
+    
+    def reset(self):
+        """Put the player back at the start"""
         self.position = 0
         self.won = False
         self.target_position = 0
         self.moving = False
         self.move_progress = 0
-        self.move_path = []
+        self.move_path = range(0)
         self.current_move_index = 0
-        self.particles = []
+        self.track = ()
+        self.track_index = 0
         
-    def move_to(self, target_pos):
+    def move_to(self, target_pos, landed=None, track=()):
+        """Walk to landed cell by cell, then ride track (a snake or ladder) to target_pos"""
+        if landed is None:
+            landed = target_pos
         self.target_position = target_pos
-        self.moving = True
         self.move_progress = 0
         self.current_move_index = 0
-        self.move_path = self.calculate_move_path(self.position, target_pos)
+        self.move_path = self.calculate_move_path(self.position, landed)
+        self.track = track
+        self.track_index = 0
+        # A bounce can land back on the starting cell, leaving nothing to animate
+        self.moving = bool(self.move_path) or len(track) > 1
         
     def calculate_move_path(self, start, end):
-        """Calculate path for smooth movement"""
-        path = []
-        current = start
-        
-        while current != end:
-            if current < end:
-                current += 1
-            else:
-                current -= 1
-            path.append(current)
-            
-        return path
+        """Cells visited on the way from start to end, as a range"""
+        if end >= start:
+            return range(start + 1, end + 1)
+        return range(start - 1, end - 1, -1)
     
-    def update_movement(self):
-        if self.moving:
-            self.move_progress += 0.05
+    def next_cell(self):
+        """Cell the token is currently animating towards, if any"""
+        if self.moving and self.current_move_index < len(self.move_path):
+            return self.move_path[self.current_move_index]
+        return None
+    
+    @property
+    def sliding(self):
+        """True while riding a snake or ladder track after the walk"""
+        return self.moving and self.current_move_index >= len(self.move_path)
+    
+    def update_movement(self, cell_positions, win_cell):
+        """Advance the token along its path using the game's coordinate table"""
+        if not self.moving:
+            return
+        
+        if self.sliding:
+            # Track segments take a fixed time and spawn nothing until the end
+            self.move_progress += TRACK_SPEED
             if self.move_progress >= 1:
                 self.move_progress = 0
-                self.position = self.move_path[self.current_move_index]
-                self.current_move_index += 1
-                
-                # Create particles at new position
-                x, y = game.get_cell_position(self.position)
-                for _ in range(5):
-                    self.particles.append(Particle(x, y, self.color))
-                
-                if self.current_move_index >= len(self.move_path):
-                    self.moving = False
-                    self.position = self.target_position
-                    
-                    # Check for win
-                    if self.position == 100:
-                        self.won = True
-                        # Create celebration particles
-                        x, y = game.get_cell_position(100)
-                        for _ in range(30):
-                            self.particles.append(Particle(x, y, GOLD))
-        
-        # Update particles
-        self.particles = [p for p in self.particles if p.update()]
+                self.track_index += 1
+                if self.track_index >= len(self.track) - 1:
+                    x, y = cell_positions[self.target_position]
+                    self.particles.spawn(x, y, self.color, 5)
+                    self.finish_move(cell_positions, win_cell)
+            return
         
-    def draw(self, screen, x, y):
-        # Draw particles
-        for particle in self.particles:
-            particle.draw(screen)
+        self.move_progress += MOVE_SPEED
+        if self.move_progress >= 1:
+            self.move_progress = 0
+            self.position = self.move_path[self.current_move_index]
+            self.current_move_index += 1
+            
+            # Create particles at new position
+            x, y = cell_positions[self.position]
+            self.particles.spawn(x, y, self.color, 5)
             
+            if self.current_move_index >= len(self.move_path) and len(self.track) < 2:
+                self.finish_move(cell_positions, win_cell)
+    
+    def finish_move(self, cell_positions, win_cell):
+        self.moving = False
+        self.position = self.target_position
+        self.track = ()
+        
+        # Check for win
+        if self.position == win_cell:
+            self.won = True
+            # Create celebration particles
+            x, y = cell_positions[win_cell]
+            self.particles.spawn(x, y, GOLD, 30)
+        
+    def sprite(self, radius):
+        """Token surface of a given radius with the number on it, rendered once"""
+        sprite = self.sprites.get(radius)
+        if sprite is not None:
+            return sprite
+        
+        size = 2 * radius + 2
+        center = (radius + 1, radius + 1)
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        
         # Draw player token with gradient effect
-        radius = CELL_SIZE // 3
-        pygame.draw.circle(screen, self.color, (x, y), radius)
-        pygame.draw.circle(screen, WHITE, (x, y), radius, 2)
+        pygame.draw.circle(sprite, self.color, center, radius)
+        pygame.draw.circle(sprite, WHITE, center, radius, 2)
         
         # Add shine effect
         shine_radius = max(2, radius // 3)
-        shine_pos = (x - radius//3, y - radius//3)
-        pygame.draw.circle(screen, WHITE, shine_pos, shine_radius)
+        shine_pos = (center[0] - radius//3, center[1] - radius//3)
+        pygame.draw.circle(sprite, WHITE, shine_pos, shine_radius)
+        
+        # Draw player number, scaled down on crowded cells
+        font_size = 16 * radius // (CELL_SIZE // 3)
+        if font_size >= 7:
+            font = get_font('arial', font_size, bold=True)
+            text = render_text(font, str(self.number), WHITE)
+            sprite.blit(text, text.get_rect(center=center))
         
-        # Draw player number
-        font = pygame.font.SysFont('arial', 16, bold=True)
-        text = font.render(str(self.number), True, WHITE)
-        text_rect = text.get_rect(center=(x, y))
-        screen.blit(text, text_rect)
+        self.sprites[radius] = sprite
+        return sprite
+    
+    def draw(self, screen, x, y, radius=None):
+        """Draw the token, returning the area touched"""
+        if radius is None:
+            radius = CELL_SIZE // 3
+        rect = screen.blit(self.sprite(radius), (x - radius - 1, y - radius - 1))
         
         # Draw player name if space allows
-        if CELL_SIZE > 50:
-            name_font = pygame.font.SysFont('arial', 10)
-            name_text = name_font.render(self.name, True, WHITE)
+        if CELL_SIZE > 50 and radius == CELL_SIZE // 3:
+            name_font = get_font('arial', 10)
+            name_text = render_text(name_font, self.name, WHITE)
             name_rect = name_text.get_rect(center=(x, y + radius + 10))
-            screen.blit(name_text, name_rect)
+            rect.union_ip(screen.blit(name_text, name_rect))
+        
+        return rect
+
+class AIPlayer(Player):
+    """Computer player; the game rolls for it and asks variants.ExpectimaxAI to choose"""
+    __slots__ = ()
+    is_ai = True
 
 class AnimatedDice:
     def __init__(self):
-        self.value = 1
-        self.rolling = False
-        self.roll_start_time = 0
-        self.animation_angle = 0
+        self.reset()
         self.create_dice_surfaces()
+        # Rotated roll-animation frames keyed by (value, angle)
+        self.rotated_frames = {}
         
     def create_dice_surfaces(self):
         self.surfaces = {}
@@ -202,194 +298,663 @@ class AnimatedDice:
                 
             self.surfaces[value] = surf
     
-    def roll(self):
+    def reset(self):
+        """Stop any roll and show the 1 face, keeping rendered surfaces"""
+        self.value = 1
+        self.rolling = False
+        self.roll_time = 0.0
+        self.animation_angle = 0
+    
+    def rotated_frame(self, value, angle):
+        """Return the rotated surface for a face, rendering it on first use"""
+        key = (value, angle % 360)
+        frame = self.rotated_frames.get(key)
+        if frame is None:
+            frame = pygame.transform.rotate(self.surfaces[value], key[1])
+            self.rotated_frames[key] = frame
+        return frame
+    
+    def roll(self, result):
+        """Start the roll animation, landing on a result decided by the caller"""
         self.rolling = True
-        self.roll_start_time = time.time()
+        self.result = result
+        self.roll_time = 0.0
         self.animation_angle = 0
         
     def update(self):
         if self.rolling:
-            self.animation_angle += 30
-            if time.time() - self.roll_start_time > 1.0:
+            # Advance by one fixed step, independent of the render rate
+            self.animation_angle += ROLL_SPIN
+            self.roll_time += STEP
+            if self.roll_time > ROLL_DURATION:
                 self.rolling = False
-                self.value = random.randint(1, 6)
+                self.value = self.result
                 return True
             else:
+                # Faces shown while spinning are cosmetic
                 self.value = random.randint(1, 6)
         return False
     
     def draw(self, screen, x, y):
         if self.rolling:
             # Animated rotation during roll
-            rotated_surface = pygame.transform.rotate(self.surfaces[self.value], self.animation_angle)
+            rotated_surface = self.rotated_frame(self.value, self.animation_angle)
             new_rect = rotated_surface.get_rect(center=(x + 40, y + 40))
-            screen.blit(rotated_surface, new_rect)
+            return screen.blit(rotated_surface, new_rect)
         else:
-            screen.blit(self.surfaces[self.value], (x, y))
+            return screen.blit(self.surfaces[self.value], (x, y))
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Snake and Ladders - Enhanced Edition")
+    def __init__(self, render_mode="full", show_stats=False, background=None, fps=FPS,
+                 headless=False, profiler=None, board=DEFAULT_BOARD, seed=None, log_dir=None,
+                 num_players=2, rules=None, ai_players=0, ai_budget=0.25, stats_db=None):
+        if not 1 <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"num_players must be between 1 and {MAX_PLAYERS}")
+        self.render_mode = render_mode
+        self.board = board
+        # Disabled profilers cost one attribute check per phase
+        self.profiler = profiler or FrameProfiler()
+        self.headless = headless
+        self.fps = fps
+        self.background_provider = background or DefaultGradient()
+        self.show_stats = show_stats
+        self.profile_path = None
+        if headless:
+            # Render into an offscreen surface; nothing is ever presented
+            self.screen = pygame.Surface((WIDTH, HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption("Snake and Ladders - Enhanced Edition")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
+        
+        # Particles for every player live in one pooled system
+        self.particles = ParticleSystem()
         
         # Create players with names
-        self.players = [
-            Player(1, RED, "Player 1"),
-            Player(2, BLUE, "Player 2")
-        ]
+        # The last ai_players seats are computer players
+        self.players = []
+        for seat in range(num_players):
+            if seat >= num_players - ai_players:
+                player = AIPlayer(seat + 1, player_color(seat), f"CPU {seat + 1}", self.particles)
+            else:
+                player = Player(seat + 1, player_color(seat), f"Player {seat + 1}", self.particles)
+            self.players.append(player)
+        
+        # Variant rules, and the worker process AI searches run in
+        self.rules = rules or Rules()
+        self.ai_budget = ai_budget
+        self.ai_pool = None
         
         self.dice = AnimatedDice()
+        self.dice2 = AnimatedDice()
+        self.engine = Engine(board)
+        self.font = get_font('arial', 24)
+        self.small_font = get_font('arial', 18)
+        self.title_font = get_font('arial', 36, bold=True)
+        
+        # Load background image (optional)
+        self.background = self.create_background()
+        
+        # Static board layer, rebuilt only when board_key() changes
+        self.board_surface = None
+        self.board_surface_key = None
+        
+        # Boards bigger than the window scroll with a camera instead
+        self.camera = Camera(self.screen.get_size(), self.world_size())
+        self.scrolling = (self.camera.world_width > self.camera.width
+                          or self.camera.world_height > self.camera.height)
+        self.jump_index = None
+        # Rendered board chunks for scrolling boards, least recently used first
+        self.chunks = OrderedDict()
+        self.chunk_capacity = 2 * (WIDTH // CHUNK_SIZE + 2) * (HEIGHT // CHUNK_SIZE + 2)
+        
+        # Cell centers and snake paths, rebuilt only when the layout changes
+        self.layout_key = None
+        self.cell_positions = []
+        self.snake_paths = {}
+        # Animation tracks keyed by (start cell, end cell), see jump_track
+        self.tracks = {}
+        self.update_layout()
+        
+        # Dirty-rectangle bookkeeping for render_mode "dirty"
+        self.dirty_rects = []
+        self.last_scene = None
+        self.full_redraw = True
+        
+        # Recent frame times in seconds, covering update and present
+        self.frame_times = deque(maxlen=fps)
+        
+        # Every game gets its own seed, drawn from one seeded sequence
+        self.seeds = random.Random(seed)
+        self.log_dir = log_dir
+        self.log = None
+        
+        # Finished games go to a StatsStore, whose aggregates feed the dashboard
+        self.stats_store = StatsStore(stats_db) if stats_db else None
+        self.stats_panel = None
+        self.stats_panel_version = None
+        
+        self.reset()
+    
+    def reset(self):
+        """Start a new game, reusing the window, fonts, dice and board cache"""
+        for player in self.players:
+            player.reset()
+        self.particles.clear()
+        self.dice.reset()
+        self.dice2.reset()
+        # Dice values of the current roll and the moves they allow, while choosing
+        self.rolls = ()
+        self.pending = None
+        self.ai_future = None
         self.current_player = 0
         self.game_over = False
         self.winner = None
-        self.message = "Player 1's turn - Click to roll dice"
-        self.font = pygame.font.SysFont('arial', 24)
-        self.small_font = pygame.font.SysFont('arial', 18)
-        self.title_font = pygame.font.SysFont('arial', 36, bold=True)
+        # Counters for the engine.GameResult recorded when the game ends
+        self.turns = 0
+        self.hit_counts = [0, 0, 0]
+        self.bounces = 0
+        self.message = f"{self.players[0].name}'s turn - Click to roll dice"
+        self.timestep.reset()
         
-        # Load background image (optional)
-        self.background = self.create_background()
+        # Seed the dice and start a new move log
+        self.seed = self.seeds.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.close_log()
+        if self.log_dir is not None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            path = os.path.join(self.log_dir, f"game-{self.seed}.jsonl")
+            self.log = GameLog(path, self.seed, self.board, len(self.players), self.engine.sides,
+                               self.rules)
         
+        self.camera.center_on(*self.get_cell_position(0))
+        # Make sure the first frame of the new game is presented
+        self.last_scene = None
+        
+    def close_ai(self):
+        if self.ai_pool is not None:
+            self.ai_pool.shutdown(wait=False, cancel_futures=True)
+            self.ai_pool = None
+    
+    def close_stats(self):
+        if self.stats_store is not None:
+            self.stats_store.close()
+            self.stats_store = None
+    
+    def close_log(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+    
     def create_background(self):
-        """Create a gradient background"""
-        surf = pygame.Surface((WIDTH, HEIGHT))
-        for y in range(HEIGHT):
-            # Gradient from light blue to lighter blue
-            color = (200 - y//8, 230 - y//8, 255 - y//8)
-            pygame.draw.line(surf, color, (0, y), (WIDTH, y))
-        return surf
+        """Create a gradient background, shared across resets via the cache"""
+        return get_background(self.background_provider, self.screen.get_size())
+    
+    def layout(self):
+        """Everything cell positions and snake paths depend on"""
+        return (self.board.hash, CELL_SIZE, BOARD_MARGIN)
+    
+    def update_layout(self):
+        """Rebuild the coordinate table and the caches derived from it if stale"""
+        key = self.layout()
+        if key == self.layout_key:
+            return
+        self.layout_key = key
+        self.cell_positions = [self.compute_cell_position(i) for i in range(self.board.size + 1)]
+        self.snake_paths.clear()
+        self.tracks.clear()
+        if self.scrolling:
+            self.jump_index = self.build_jump_index()
+            self.chunks.clear()
     
     def get_cell_position(self, cell_number):
         """Convert cell number to screen coordinates"""
+        return self.cell_positions[cell_number]
+    
+    def compute_cell_position(self, cell_number):
+        """Serpentine row and column math behind the coordinate table"""
+        columns, rows = self.board.columns, self.board.rows
         if cell_number == 0:
-            return BOARD_MARGIN - CELL_SIZE//2, HEIGHT - BOARD_MARGIN - CELL_SIZE//2
+            return BOARD_MARGIN - CELL_SIZE//2, BOARD_MARGIN + rows * CELL_SIZE - CELL_SIZE//2
             
-        row = (cell_number - 1) // GRID_SIZE
-        col = (cell_number - 1) % GRID_SIZE
+        row = (cell_number - 1) // columns
+        col = (cell_number - 1) % columns
         
         # Alternate direction for each row
         if row % 2 == 1:
-            col = GRID_SIZE - 1 - col
+            col = columns - 1 - col
             
         x = BOARD_MARGIN + col * CELL_SIZE + CELL_SIZE // 2
-        y = HEIGHT - BOARD_MARGIN - row * CELL_SIZE - CELL_SIZE // 2
+        y = BOARD_MARGIN + (rows - 1 - row) * CELL_SIZE + CELL_SIZE // 2
         return x, y
     
-    def draw_board(self):
-        # Draw background
-        self.screen.blit(self.background, (0, 0))
+    def world_size(self):
+        """Size in pixels of the whole board including its margin"""
+        return (self.board.columns * CELL_SIZE + 2 * BOARD_MARGIN,
+                self.board.rows * CELL_SIZE + 2 * BOARD_MARGIN)
+    
+    def build_jump_index(self):
+        """Spatial index of every snake and ladder by the world area it covers"""
+        index = SpatialIndex()
+        for kind, jumps in (("snake", self.board.snakes), ("ladder", self.board.ladders)):
+            for start, end in jumps.items():
+                start_pos = self.get_cell_position(start)
+                end_pos = self.get_cell_position(end)
+                # A quadratic Bezier stays inside the hull of its control points
+                control = self.snake_control_point(start_pos, end_pos)
+                xs = (start_pos[0], end_pos[0], control[0])
+                ys = (start_pos[1], end_pos[1], control[1])
+                rect = pygame.Rect(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+                index.insert((kind, start, end), rect.inflate(2 * CELL_SIZE, 2 * CELL_SIZE))
+        return index
+    
+    def visible_cells(self, rect):
+        """Cell numbers whose squares overlap a world-space rect"""
+        columns, rows = self.board.columns, self.board.rows
+        first_col = max(0, (rect.left - BOARD_MARGIN) // CELL_SIZE)
+        last_col = min(columns - 1, (rect.right - BOARD_MARGIN) // CELL_SIZE)
+        # Rows count up from the bottom of the board
+        first_row = max(0, rows - 1 - (rect.bottom - BOARD_MARGIN) // CELL_SIZE)
+        last_row = min(rows - 1, rows - 1 - (rect.top - BOARD_MARGIN) // CELL_SIZE)
         
-        # Draw board background
-        board_rect = pygame.Rect(
-            BOARD_MARGIN - 20, 
-            BOARD_MARGIN - 20,
-            GRID_SIZE * CELL_SIZE + 40,
-            GRID_SIZE * CELL_SIZE + 40
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                index = row * columns + (columns - 1 - col if row % 2 == 1 else col)
+                if index < self.board.size:
+                    yield index + 1
+    
+    def board_key(self):
+        """Everything the static board layer depends on"""
+        return (
+            self.screen.get_size(),
+            self.background_provider.key(),
+            self.board.hash,
+            CELL_SIZE,
+            BOARD_MARGIN,
         )
-        pygame.draw.rect(self.screen, BOARD_BG, board_rect, border_radius=15)
-        pygame.draw.rect(self.screen, BLACK, board_rect, 3, border_radius=15)
+    
+    def get_board_surface(self):
+        """Return the pre-rendered static board, rebuilding it if stale"""
+        key = self.board_key()
+        if self.board_surface is None or self.board_surface_key != key:
+            self.board_surface = self.render_board_surface()
+            self.board_surface_key = key
+            self.full_redraw = True
+        return self.board_surface
+    
+    def render_board_surface(self):
+        """Render the parts of the board that never change during a game"""
+        surface = pygame.Surface(self.screen.get_size())
         
-        # Draw title
-        title_text = self.title_font.render("SNAKE AND LADDERS", True, BLUE)
-        self.screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 10))
+        with self.profiler.phase("background"):
+            # Draw background
+            surface.blit(self.background, (0, 0))
         
-        # Draw cells
-        for i in range(1, 101):
-            x, y = self.get_cell_position(i)
-            
-            # Alternate cell colors
-            row = (i - 1) // GRID_SIZE
-            col = (i - 1) % GRID_SIZE
-            color = GRID_COLOR1 if (row + col) % 2 == 0 else GRID_COLOR2
-            
-            # Draw cell with rounded corners
-            cell_rect = pygame.Rect(
-                x - CELL_SIZE // 2, 
-                y - CELL_SIZE // 2,
-                CELL_SIZE, 
-                CELL_SIZE
+            # Draw board background
+            board_rect = pygame.Rect(
+                BOARD_MARGIN - 20, 
+                BOARD_MARGIN - 20,
+                self.board.columns * CELL_SIZE + 40,
+                self.board.rows * CELL_SIZE + 40
             )
-            pygame.draw.rect(self.screen, color, cell_rect, border_radius=8)
-            pygame.draw.rect(self.screen, BLACK, cell_rect, 1, border_radius=8)
-            
-            # Draw cell number
-            text = self.small_font.render(str(i), True, BLACK)
-            self.screen.blit(text, (x - text.get_width() // 2, y - text.get_height() // 2))
+            pygame.draw.rect(surface, BOARD_BG, board_rect, border_radius=15)
+            pygame.draw.rect(surface, BLACK, board_rect, 3, border_radius=15)
+        
+            # Draw title
+            title_text = self.title_font.render("SNAKE AND LADDERS", True, BLUE)
+            surface.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 10))
+        
+        with self.profiler.phase("cells"):
+            # Draw cells
+            for i in range(1, self.board.size + 1):
+                self.draw_cell(surface, i, self.get_cell_position(i))
+        
+        with self.profiler.phase("snakes"):
+            # Draw snakes with better graphics
+            for start, end in self.board.snakes.items():
+                self.draw_full_snake(surface, self.get_cell_position(start), self.get_cell_position(end))
+        
+        with self.profiler.phase("ladders"):
+            # Draw ladders with better graphics
+            for start, end in self.board.ladders.items():
+                start_pos = self.get_cell_position(start)
+                end_pos = self.get_cell_position(end)
+                self.draw_ladder(surface, start_pos, end_pos)
+        
+        return surface
+    
+    def draw_cell(self, surface, i, pos):
+        """Draw one numbered cell centered on pos"""
+        x, y = pos
+        
+        # Alternate cell colors
+        row = (i - 1) // self.board.columns
+        col = (i - 1) % self.board.columns
+        color = GRID_COLOR1 if (row + col) % 2 == 0 else GRID_COLOR2
+        
+        # Draw cell with rounded corners
+        cell_rect = pygame.Rect(
+            x - CELL_SIZE // 2, 
+            y - CELL_SIZE // 2,
+            CELL_SIZE, 
+            CELL_SIZE
+        )
+        pygame.draw.rect(surface, color, cell_rect, border_radius=8)
+        pygame.draw.rect(surface, BLACK, cell_rect, 1, border_radius=8)
+        
+        # Draw cell number
+        text = self.small_font.render(str(i), True, BLACK)
+        surface.blit(text, (x - text.get_width() // 2, y - text.get_height() // 2))
+    
+    def draw_full_snake(self, surface, start_pos, end_pos, offset=(0, 0)):
+        """Draw a snake's body, head and tail, shifted by offset onto surface"""
+        # Draw snake body with curves
+        self.draw_snake(surface, start_pos, end_pos, offset)
+        
+        # Draw snake head at start
+        ox, oy = offset
+        start_pos = (start_pos[0] + ox, start_pos[1] + oy)
+        end_pos = (end_pos[0] + ox, end_pos[1] + oy)
+        self.draw_snake_head(surface, start_pos, end_pos)
+        
+        # Draw snake tail at end
+        pygame.draw.circle(surface, DARK_GREEN, end_pos, 8)
+    
+    def get_chunk(self, cx, cy):
+        """Return a cached board chunk, rendering it on first use"""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
         
-        # Draw snakes with better graphics
-        for start, end in snakes.items():
+        with self.profiler.phase("chunks"):
+            chunk = self.chunks[key] = self.render_chunk(cx, cy)
+        while len(self.chunks) > self.chunk_capacity:
+            self.chunks.popitem(last=False)
+        return chunk
+    
+    def render_chunk(self, cx, cy):
+        """Draw the cells, snakes and ladders inside one CHUNK_SIZE square"""
+        area = pygame.Rect(cx * CHUNK_SIZE, cy * CHUNK_SIZE, CHUNK_SIZE, CHUNK_SIZE)
+        ox, oy = -area.x, -area.y
+        # Off-board areas are keyed out so the window background shows through
+        chunk = pygame.Surface(area.size)
+        chunk.fill(CHUNK_KEY)
+        chunk.set_colorkey(CHUNK_KEY, pygame.RLEACCEL)
+        
+        board_rect = pygame.Rect(
+            BOARD_MARGIN - 20 + ox,
+            BOARD_MARGIN - 20 + oy,
+            self.board.columns * CELL_SIZE + 40,
+            self.board.rows * CELL_SIZE + 40
+        )
+        pygame.draw.rect(chunk, BOARD_BG, board_rect, border_radius=15)
+        pygame.draw.rect(chunk, BLACK, board_rect, 3, border_radius=15)
+        
+        for i in self.visible_cells(area):
+            x, y = self.get_cell_position(i)
+            self.draw_cell(chunk, i, (x + ox, y + oy))
+        
+        for kind, start, end in self.jump_index.query(area):
             start_pos = self.get_cell_position(start)
             end_pos = self.get_cell_position(end)
+            if kind == "snake":
+                # World positions keep the snake path cache shared across chunks
+                self.draw_full_snake(chunk, start_pos, end_pos, (ox, oy))
+            else:
+                start_pos = (start_pos[0] + ox, start_pos[1] + oy)
+                end_pos = (end_pos[0] + ox, end_pos[1] + oy)
+                self.draw_ladder(chunk, start_pos, end_pos)
+        return chunk
+    
+    def draw_viewport(self):
+        """Draw only the part of a scrolling board that is on screen"""
+        visible = self.camera.visible_rect
+        ox, oy = self.camera.offset
+        
+        with self.profiler.phase("background"):
+            self.screen.blit(self.background, (0, 0))
+        
+        # Composite the cached chunks overlapping the visible rect
+        blits = []
+        for cx in range(visible.left // CHUNK_SIZE, (visible.right - 1) // CHUNK_SIZE + 1):
+            for cy in range(visible.top // CHUNK_SIZE, (visible.bottom - 1) // CHUNK_SIZE + 1):
+                position = (cx * CHUNK_SIZE + ox, cy * CHUNK_SIZE + oy)
+                blits.append((self.get_chunk(cx, cy), position))
+        self.screen.blits(blits, False)
+        
+        # Draw title
+        title_text = render_text(self.title_font, "SNAKE AND LADDERS", BLUE)
+        self.screen.blit(title_text, (WIDTH//2 - title_text.get_width()//2, 10))
+    
+    def draw_board(self):
+        # Draw the cached static layer, then composite dynamic elements on top
+        self.update_layout()
+        with self.profiler.phase("board"):
+            if self.scrolling:
+                self.draw_viewport()
+            else:
+                self.screen.blit(self.get_board_surface(), (0, 0))
+        return self.draw_dynamic()
+    
+    def draw_dynamic(self):
+        """Draw tokens, particles, dice and text, returning the rects touched"""
+        rects = []
+        with self.profiler.phase("particles"):
+            # Draw particles underneath the tokens
+            rects.extend(self.particles.draw(self.screen, self.camera.offset))
+        
+        with self.profiler.phase("tokens"):
+            # Group players by cell once, then lay each group out so tokens don't overlap
+            cells = {}
+            for player in self.players:
+                if player.position > 0:
+                    cells.setdefault(player.position, []).append(player)
             
-            # Draw snake body with curves
-            self.draw_snake(start_pos, end_pos)
+            for group in cells.values():
+                offsets, radius = token_layout(len(group))
+                for player, (offset_x, offset_y) in zip(group, offsets):
+                    x, y = self.camera.to_screen(*self.token_position(player))
+                    rects.append(player.draw(self.screen, int(x + offset_x), int(y + offset_y), radius))
+        
+        with self.profiler.phase("dice"):
+            # Draw dice area
+            dice_area = pygame.Rect(WIDTH - 150, 100, 120, 120)
+            pygame.draw.rect(self.screen, WHITE, dice_area, border_radius=15)
+            pygame.draw.rect(self.screen, BLACK, dice_area, 2, border_radius=15)
+        
+            # Draw dice
+            rects.append(dice_area.union(self.dice.draw(self.screen, WIDTH - 140, 110)))
             
-            # Draw snake head at start
-            self.draw_snake_head(start_pos, end_pos)
+            if self.rules.dice > 1:
+                # Draw the second die below the first
+                dice_area = pygame.Rect(WIDTH - 150, 230, 120, 120)
+                pygame.draw.rect(self.screen, WHITE, dice_area, border_radius=15)
+                pygame.draw.rect(self.screen, BLACK, dice_area, 2, border_radius=15)
+                rects.append(dice_area.union(self.dice2.draw(self.screen, WIDTH - 140, 240)))
+        
+        with self.profiler.phase("panels"):
+            # Draw game info panel
+            info_panel = pygame.Rect(WIDTH - 300, HEIGHT - 200, 280, 180)
+            pygame.draw.rect(self.screen, WHITE, info_panel, border_radius=10)
+            pygame.draw.rect(self.screen, BLACK, info_panel, 2, border_radius=10)
+            rects.append(info_panel)
+        
+            # Draw message
+            text = render_text(self.font, self.message, BLUE)
+            rects.append(self.screen.blit(text, (20, 20)))
+        
+            # Draw player status, only the leaders when they don't all fit
+            shown = self.players
+            if len(shown) > STATUS_LINES:
+                shown = sorted(shown, key=lambda p: -p.position)[:STATUS_LINES]
+            for i, player in enumerate(shown):
+                status = f"{player.name}: Position {player.position}"
+                if player.won:
+                    status += " - 🏆 WINNER!"
+                text = render_text(self.small_font, status, player.color)
+                rects.append(self.screen.blit(text, (WIDTH - 290, HEIGHT - 180 + i * 30)))
             
-            # Draw snake tail at end
-            pygame.draw.circle(self.screen, DARK_GREEN, end_pos, 8)
+            if self.stats_store is not None:
+                # Draw the statistics dashboard, re-rendered only after new results
+                rects.append(self.screen.blit(self.get_stats_panel(), STATS_PANEL[:2]))
         
-        # Draw ladders with better graphics
-        for start, end in ladders.items():
-            start_pos = self.get_cell_position(start)
-            end_pos = self.get_cell_position(end)
-            self.draw_ladder(start_pos, end_pos)
+        if self.profiler.enabled:
+            rects.append(self.profiler.draw_overlay(self.screen))
         
-        # Draw players
-        player_positions = {}
-        for player in self.players:
-            if player.position > 0:
-                x, y = self.get_cell_position(player.position)
-                
-                # Offset players so they don't overlap completely
-                if player.position in player_positions:
-                    count = player_positions[player.position]
-                    angle = (count * 90) * (3.14159 / 180)
-                    offset_x = math.cos(angle) * 15
-                    offset_y = math.sin(angle) * 15
-                else:
-                    player_positions[player.position] = 0
-                    offset_x, offset_y = 0, 0
-                
-                player.draw(self.screen, int(x + offset_x), int(y + offset_y))
-                player_positions[player.position] += 1
-        
-        # Draw dice area
-        dice_area = pygame.Rect(WIDTH - 150, 100, 120, 120)
-        pygame.draw.rect(self.screen, WHITE, dice_area, border_radius=15)
-        pygame.draw.rect(self.screen, BLACK, dice_area, 2, border_radius=15)
-        
-        # Draw dice
-        self.dice.draw(self.screen, WIDTH - 140, 110)
-        
-        # Draw game info panel
-        info_panel = pygame.Rect(WIDTH - 300, HEIGHT - 200, 280, 180)
-        pygame.draw.rect(self.screen, WHITE, info_panel, border_radius=10)
-        pygame.draw.rect(self.screen, BLACK, info_panel, 2, border_radius=10)
-        
-        # Draw message
-        text = self.font.render(self.message, True, BLUE)
-        self.screen.blit(text, (20, 20))
-        
-        # Draw player status
-        for i, player in enumerate(self.players):
-            status = f"{player.name}: Position {player.position}"
-            if player.won:
-                status += " - 🏆 WINNER!"
-            text = self.small_font.render(status, True, player.color)
-            self.screen.blit(text, (WIDTH - 290, HEIGHT - 180 + i * 30))
-    
-    def draw_snake(self, start_pos, end_pos):
-        """Draw a curved snake between two points"""
-        # Calculate control points for bezier curve
+        return rects
+    
+    def get_stats_panel(self):
+        """Dashboard surface for the stored aggregates, rebuilt when the store changes"""
+        if self.stats_panel_version != self.stats_store.version:
+            summary = self.stats_store.summary(self.board, len(self.players), rules=self.rules)
+            self.stats_panel = self.render_stats_panel(summary)
+            self.stats_panel_version = self.stats_store.version
+        return self.stats_panel
+    
+    def render_stats_panel(self, summary):
+        """Draw win rates, averages and a game length histogram onto a panel surface"""
+        width, height = STATS_PANEL[2:]
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(panel, WHITE, panel.get_rect(), border_radius=10)
+        pygame.draw.rect(panel, BLACK, panel.get_rect(), 2, border_radius=10)
+        font = get_font('arial', 14)
+        
+        if not summary.games:
+            text = render_text(font, "No finished games recorded yet", BLACK)
+            panel.blit(text, text.get_rect(center=(width // 2, height // 2)))
+            return panel
+        
+        # Draw averages
+        text = render_text(font, f"{summary.games:,} games, {summary.mean_turns():.1f}"
+                                 f" +/- {summary.std_turns():.1f} turns", BLACK)
+        panel.blit(text, (10, 8))
+        text = render_text(font, f"Per game: {summary.per_game(summary.snake_hits):.1f} snakes,"
+                                 f" {summary.per_game(summary.ladder_hits):.1f} ladders,"
+                                 f" {summary.per_game(summary.bounces):.1f} bounces", BLACK)
+        panel.blit(text, (10, 28))
+        
+        # Draw win rates of the first seats in their colors
+        x = 10
+        for player, rate in zip(self.players[:4], summary.win_rates()):
+            text = render_text(font, f"P{player.number} {rate:.1%}", player.color)
+            panel.blit(text, (x, 48))
+            x += text.get_width() + 10
+        
+        # Draw the game length histogram
+        bin_width, counts = summary.length_histogram(STATS_BINS)
+        top, bottom = 72, height - 24
+        bar_width = (width - 20) // STATS_BINS
+        tallest = max(counts) or 1
+        for i, count in enumerate(counts):
+            bar_height = (bottom - top) * count // tallest
+            bar = pygame.Rect(10 + i * bar_width, bottom - bar_height, bar_width - 2, bar_height)
+            pygame.draw.rect(panel, BLUE, bar)
+        pygame.draw.line(panel, BLACK, (10, bottom), (width - 10, bottom))
+        text = render_text(font, f"Game length, {bin_width} turns per bar", BLACK)
+        panel.blit(text, (10, bottom + 3))
+        return panel
+    
+    def token_position(self, player):
+        """Screen position of a token, interpolated between simulation steps"""
+        if player.sliding:
+            # Interpolate between the track samples the token is riding
+            x, y = player.track[player.track_index]
+            next_x, next_y = player.track[player.track_index + 1]
+            t = min(1.0, player.move_progress + self.timestep.alpha * TRACK_SPEED)
+            return x + (next_x - x) * t, y + (next_y - y) * t
+        
+        x, y = self.get_cell_position(player.position)
+        next_cell = player.next_cell()
+        if next_cell is None:
+            return x, y
+        
+        t = min(1.0, player.move_progress + self.timestep.alpha * MOVE_SPEED)
+        next_x, next_y = self.get_cell_position(next_cell)
+        return x + (next_x - x) * t, y + (next_y - y) * t
+    
+    def scene_state(self):
+        """Snapshot of everything the dynamic layer shows, or None while animating"""
+        if self.profiler.enabled:
+            return None
+        if self.dice.rolling or self.particles.count or any(p.moving for p in self.players):
+            return None
+        return (
+            self.message,
+            self.dice.value,
+            self.dice2.value,
+            tuple((p.position, p.won) for p in self.players),
+            self.stats_store.version if self.stats_store is not None else None,
+        )
+    
+    def present(self):
+        """Draw the frame and push it to the display"""
+        if self.headless:
+            self.draw_board()
+            return
+        
+        # Scrolling boards change everywhere whenever the camera moves
+        if self.render_mode != "dirty" or self.scrolling:
+            self.draw_board()
+            with self.profiler.phase("flip"):
+                pygame.display.flip()
+            return
+        
+        # Skip presenting entirely while nothing on screen has changed
+        scene = self.scene_state()
+        if scene is not None and scene == self.last_scene:
+            return
+        
+        board_surface = self.get_board_surface()
+        if self.full_redraw:
+            # First frame or new board: push the whole screen once
+            self.screen.blit(board_surface, (0, 0))
+            self.dirty_rects = self.draw_dynamic()
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            # Restore the board under last frame's dynamic elements, then redraw them
+            for rect in self.dirty_rects:
+                self.screen.blit(board_surface, rect, rect)
+            rects = self.draw_dynamic()
+            with self.profiler.phase("flip"):
+                pygame.display.update(self.dirty_rects + rects)
+            self.dirty_rects = rects
+        self.last_scene = scene
+    
+    def snake_control_point(self, start_pos, end_pos):
+        """Bezier control point that bends a snake to one side"""
         dx = end_pos[0] - start_pos[0]
         dy = end_pos[1] - start_pos[1]
+        return (start_pos[0] + end_pos[0]) / 2 + dy * 0.3, (start_pos[1] + end_pos[1]) / 2 - dx * 0.3
+    
+    def draw_snake(self, surface, start_pos, end_pos, offset=(0, 0)):
+        """Draw a curved snake between two world points, shifted by offset"""
+        points, pattern = self.snake_path(start_pos, end_pos)
+        ox, oy = offset
+        if ox or oy:
+            points = [(x + ox, y + oy) for x, y in points]
+            pattern = [(x + ox, y + oy) for x, y in pattern]
+        
+        # Draw the snake body
+        if len(points) > 1:
+            pygame.draw.lines(surface, RED, False, points, 4)
+            
+            # Add pattern to snake
+            for center in pattern:
+                pygame.draw.circle(surface, (200, 50, 50), center, 3)
+    
+    def snake_path(self, start_pos, end_pos):
+        """Bezier body points and pattern dots for a snake in world coordinates, once per layout"""
+        key = (start_pos, end_pos)
+        path = self.snake_paths.get(key)
+        if path is not None:
+            return path
         
         # Create curved path
-        control_x = (start_pos[0] + end_pos[0]) / 2 + dy * 0.3
-        control_y = (start_pos[1] + end_pos[1]) / 2 - dx * 0.3
+        control_x, control_y = self.snake_control_point(start_pos, end_pos)
         
         # Draw snake body with multiple segments
         points = []
@@ -400,20 +965,49 @@ class Game:
             y = (1-t)**2 * start_pos[1] + 2*(1-t)*t * control_y + t**2 * end_pos[1]
             points.append((x, y))
         
-        # Draw the snake body
-        if len(points) > 1:
-            pygame.draw.lines(self.screen, RED, False, points, 4)
-            
-            # Add pattern to snake
-            for i in range(0, len(points)-1, 3):
-                if i + 1 < len(points):
-                    seg_start = points[i]
-                    seg_end = points[i + 1]
-                    mid_x = (seg_start[0] + seg_end[0]) / 2
-                    mid_y = (seg_start[1] + seg_end[1]) / 2
-                    pygame.draw.circle(self.screen, (200, 50, 50), (int(mid_x), int(mid_y)), 3)
-    
-    def draw_snake_head(self, start_pos, end_pos):
+        # Pattern dots sit halfway along every third segment
+        pattern = []
+        for i in range(0, len(points)-1, 3):
+            seg_start = points[i]
+            seg_end = points[i + 1]
+            mid_x = (seg_start[0] + seg_end[0]) / 2
+            mid_y = (seg_start[1] + seg_end[1]) / 2
+            pattern.append((int(mid_x), int(mid_y)))
+        
+        path = self.snake_paths[key] = (points, pattern)
+        return path
+    
+    def jump_track(self, start, end):
+        """TRACK_SAMPLES + 1 world points a token follows down a snake or up a ladder
+        
+        Snakes follow the same Bezier curve draw_snake draws, ladders the
+        straight line between their rails. Tracks are cached per layout.
+        """
+        key = (start, end)
+        track = self.tracks.get(key)
+        if track is not None:
+            return track
+        
+        start_pos = self.get_cell_position(start)
+        end_pos = self.get_cell_position(end)
+        if end < start:
+            control_x, control_y = self.snake_control_point(start_pos, end_pos)
+        else:
+            control_x = (start_pos[0] + end_pos[0]) / 2
+            control_y = (start_pos[1] + end_pos[1]) / 2
+        
+        # A ladder is a bezier whose control point sits on the line
+        points = []
+        for i in range(TRACK_SAMPLES + 1):
+            t = i / TRACK_SAMPLES
+            x = (1-t)**2 * start_pos[0] + 2*(1-t)*t * control_x + t**2 * end_pos[0]
+            y = (1-t)**2 * start_pos[1] + 2*(1-t)*t * control_y + t**2 * end_pos[1]
+            points.append((x, y))
+        
+        track = self.tracks[key] = tuple(points)
+        return track
+    
+    def draw_snake_head(self, surface, start_pos, end_pos):
         """Draw snake head with direction"""
         # Calculate direction
         dx = end_pos[0] - start_pos[0]
@@ -431,16 +1025,16 @@ class Game:
              start_pos[1] + math.sin(angle - 2.5) * head_size * 0.7)
         ]
         
-        pygame.draw.polygon(self.screen, RED, points)
+        pygame.draw.polygon(surface, RED, points)
         # Draw eyes
         eye_pos = (
             start_pos[0] + math.cos(angle) * head_size * 0.5,
             start_pos[1] + math.sin(angle) * head_size * 0.5
         )
-        pygame.draw.circle(self.screen, WHITE, (int(eye_pos[0]), int(eye_pos[1])), 3)
-        pygame.draw.circle(self.screen, BLACK, (int(eye_pos[0]), int(eye_pos[1])), 1)
+        pygame.draw.circle(surface, WHITE, (int(eye_pos[0]), int(eye_pos[1])), 3)
+        pygame.draw.circle(surface, BLACK, (int(eye_pos[0]), int(eye_pos[1])), 1)
     
-    def draw_ladder(self, start_pos, end_pos):
+    def draw_ladder(self, surface, start_pos, end_pos):
         """Draw a detailed ladder between two points"""
         dx = end_pos[0] - start_pos[0]
         dy = end_pos[1] - start_pos[1]
@@ -462,8 +1056,8 @@ class Game:
         side2_start = (start_pos[0] - perp_dx * side_offset, start_pos[1] - perp_dy * side_offset)
         side2_end = (end_pos[0] - perp_dx * side_offset, end_pos[1] - perp_dy * side_offset)
         
-        pygame.draw.line(self.screen, BROWN, side1_start, side1_end, 4)
-        pygame.draw.line(self.screen, BROWN, side2_start, side2_end, 4)
+        pygame.draw.line(surface, BROWN, side1_start, side1_end, 4)
+        pygame.draw.line(surface, BROWN, side2_start, side2_end, 4)
         
         # Draw ladder rungs
         num_rungs = max(3, int(length / 20))
@@ -477,70 +1071,212 @@ class Game:
                 side2_start[0] + (side2_end[0] - side2_start[0]) * t,
                 side2_start[1] + (side2_end[1] - side2_start[1]) * t
             )
-            pygame.draw.line(self.screen, BROWN, rung_start, rung_end, 3)
+            pygame.draw.line(surface, BROWN, rung_start, rung_end, 3)
     
     def handle_click(self):
         if self.game_over:
             # Reset game
-            self.__init__()
+            self.reset()
             return
-            
-        if not self.dice.rolling and not any(player.moving for player in self.players):
-            self.dice.roll()
-            self.message = f"{self.players[self.current_player].name} is rolling..."
+        
+        # Computer players roll and choose on their own
+        if self.players[self.current_player].is_ai:
+            return
+        
+        if self.pending is not None:
+            # A click takes the first move on offer
+            self.choose(0)
+        elif not self.dice.rolling and not any(player.moving for player in self.players):
+            self.start_roll()
+    
+    def handle_key(self, key):
+        # Number keys pick one of the moves on offer
+        if self.pending is not None and not self.players[self.current_player].is_ai:
+            index = key - pygame.K_1
+            if 0 <= index < len(self.pending):
+                self.choose(index)
+    
+    def start_roll(self):
+        self.rolls = self.rules.roll(self.rng, self.engine.sides)
+        self.dice.roll(self.rolls[0])
+        if len(self.rolls) > 1:
+            self.dice2.roll(self.rolls[1])
+        self.message = f"{self.players[self.current_player].name} is rolling..."
+    
+    def choice_message(self, options):
+        """Prompt listing the moves on offer, numbered for the keyboard"""
+        labels = []
+        for i, option in enumerate(options):
+            label = f"[{i + 1}] {option.roll}: to {option.to}"
+            if option.hit == HIT_LADDER:
+                label += " (ladder)"
+            elif option.hit == HIT_SNAKE:
+                label += " (snake)"
+            labels.append(label)
+        return f"{self.players[self.current_player].name}: " + "  ".join(labels)
+    
+    def request_ai_move(self):
+        """Start a search for the current AI player without blocking the frame"""
+        if self.ai_pool is None:
+            self.ai_pool = ProcessPoolExecutor(
+                1, initializer=init_worker, initargs=(self.board, self.rules, self.ai_budget)
+            )
+        positions = [player.position for player in self.players]
+        try:
+            self.ai_future = self.ai_pool.submit(choose_move, positions, self.current_player,
+                                                 self.pending)
+        except BrokenProcessPool:
+            # The worker died since the last search; move without it this turn
+            self.close_ai()
+            self.choose(0)
+    
+    def choose(self, index):
+        option = self.pending[index]
+        self.pending = None
+        self.ai_future = None
+        self.apply_move(option)
+    
+    def apply_move(self, option):
+        """Move the current player as option says and pass the turn on"""
+        current_player = self.players[self.current_player]
+        if self.log is not None:
+            self.log.record(self.current_player, option.roll, current_player.position,
+                            option.to, option.hit, option.bounced)
+        self.turns += 1
+        self.hit_counts[option.hit] += 1
+        self.bounces += option.bounced
+        
+        # Start movement animation, riding any snake or ladder along its track
+        if option.hit == HIT_NONE:
+            current_player.move_to(option.to)
+        else:
+            landed = land(current_player.position, option.roll, self.board.size)
+            current_player.move_to(option.to, landed, self.jump_track(landed, option.to))
+        
+        if option.to == self.board.size:
+            self.game_over = True
+            self.winner = self.current_player
+            self.close_log()
+            if self.stats_store is not None:
+                result = GameResult(self.winner, self.turns, self.hit_counts[HIT_SNAKE],
+                                    self.hit_counts[HIT_LADDER], self.bounces)
+                self.stats_store.record(result, self.board, len(self.players), seed=self.seed,
+                                        rules=self.rules)
+            self.message = f"🎉 {current_player.name} WINS! Click to play again"
+        else:
+            self.current_player = (self.current_player + 1) % len(self.players)
+            self.message = f"{self.players[self.current_player].name}'s turn - Click to roll dice"
     
     def update(self):
+        self.update_layout()
+        
         # Update player movements
-        for player in self.players:
-            player.update_movement()
+        with self.profiler.phase("movement"):
+            for player in self.players:
+                player.update_movement(self.cell_positions, self.board.size)
+            self.particles.update()
+        
+        if self.scrolling:
+            # Follow whoever is moving, otherwise the player about to roll
+            followed = next((p for p in self.players if p.moving), self.players[self.current_player])
+            self.camera.follow(*self.token_position(followed))
         
         # Update dice
         if self.dice.rolling:
+            self.dice2.update()
             if self.dice.update():
                 # Dice finished rolling
                 if not any(player.moving for player in self.players):
-                    steps = self.dice.value
                     current_player = self.players[self.current_player]
                     
-                    # Calculate new position
-                    new_pos = current_player.position + steps
-                    if new_pos > 100:
-                        new_pos = 100 - (new_pos - 100)
-                    
-                    # Apply snakes and ladders
-                    if new_pos in snakes:
-                        new_pos = snakes[new_pos]
-                    elif new_pos in ladders:
-                        new_pos = ladders[new_pos]
-                    
-                    # Start movement animation
-                    current_player.move_to(new_pos)
-                    
-                    if new_pos == 100:
-                        self.game_over = True
-                        self.winner = self.current_player
-                        self.message = f"🎉 {current_player.name} WINS! Click to play again"
+                    # Moves the roll allows, applying bounce, snakes and ladders
+                    options = self.rules.options(self.engine, current_player.position, self.rolls)
+                    if len(options) == 1:
+                        self.apply_move(options[0])
                     else:
-                        self.current_player = (self.current_player + 1) % len(self.players)
-                        self.message = f"{self.players[self.current_player].name}'s turn - Click to roll dice"
+                        self.pending = options
+                        self.message = self.choice_message(options)
+                        if current_player.is_ai:
+                            self.request_ai_move()
+        
+        if not self.game_over and self.players[self.current_player].is_ai:
+            if self.pending is None:
+                if not self.dice.rolling and not any(player.moving for player in self.players):
+                    self.start_roll()
+            elif self.ai_future is not None and self.ai_future.done():
+                if self.ai_future.exception() is not None:
+                    # A failed search falls back to the first move on offer, and
+                    # the next search gets a fresh worker in case this one broke
+                    self.close_ai()
+                    self.choose(0)
+                else:
+                    self.choose(self.ai_future.result())
+    
+    def frame_stats(self):
+        """Average frame time and text cache effectiveness as a short string"""
+        average = sum(self.frame_times) / max(1, len(self.frame_times))
+        return (f"{average * 1000:.2f} ms/frame - text cache {text_cache.hit_rate():.0%} hits, "
+                f"{text_cache.render_time * 1000:.1f} ms spent rendering")
     
     def run(self):
         running = True
+        dt = 0.0
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    self.handle_click()
+            with self.profiler.phase("events"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        running = False
+                    elif event.type == pygame.MOUSEBUTTONDOWN:
+                        self.handle_click()
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        # Toggle the profiler overlay
+                        self.profiler.toggle()
+                        self.full_redraw = True
+                    elif event.type == pygame.KEYDOWN:
+                        self.handle_key(event.key)
             
-            self.update()
-            self.draw_board()
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            frame_start = time.perf_counter()
+            # Run as many fixed simulation steps as real time calls for
+            with self.profiler.phase("update"):
+                for _ in range(self.timestep.advance(dt)):
+                    self.update()
+            self.present()
+            self.frame_times.append(time.perf_counter() - frame_start)
+            self.profiler.end_frame()
+            
+            if self.show_stats and len(self.frame_times) == self.fps:
+                pygame.display.set_caption(self.frame_stats())
+                self.frame_times.clear()
+            dt = self.clock.tick(self.fps) / 1000
         
+        if self.profile_path:
+            self.profiler.dump(self.profile_path)
+        self.close_log()
+        self.close_ai()
+        self.close_stats()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
+    fps = FPS
+    if "--fps" in sys.argv:
+        fps = int(sys.argv[sys.argv.index("--fps") + 1])
+    game = Game(
+        render_mode="dirty" if "--dirty-rects" in sys.argv else "full",
+        show_stats="--stats" in sys.argv,
+        fps=fps,
+        profiler=FrameProfiler(enabled="--profile" in sys.argv),
+        board=load_board(sys.argv[sys.argv.index("--board") + 1]) if "--board" in sys.argv else DEFAULT_BOARD,
+        seed=int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else None,
+        log_dir=sys.argv[sys.argv.index("--log-dir") + 1] if "--log-dir" in sys.argv else None,
+        num_players=int(sys.argv[sys.argv.index("--players") + 1]) if "--players" in sys.argv else 2,
+        rules=Rules(2 if "--two-dice" in sys.argv else 1, "--optional-ladders" in sys.argv),
+        ai_players=int(sys.argv[sys.argv.index("--ai") + 1]) if "--ai" in sys.argv else 0,
+        stats_db=sys.argv[sys.argv.index("--stats-db") + 1] if "--stats-db" in sys.argv else None
+    )
+    if "--profile" in sys.argv:
+        # Optional CSV/JSON path for the profile written on exit
+        index = sys.argv.index("--profile") + 1
+        if index < len(sys.argv) and not sys.argv[index].startswith("--"):
+            game.profile_path = sys.argv[index]
     game.run()
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""Exact Markov-chain analysis of a Snake and Ladders board.
+
+A single player's position is a Markov chain over cells 0..WIN_CELL with
+the win cell absorbing. Players never interact, so the turn-count
+distribution of one player is enough to derive exact game lengths and
+per-seat win probabilities for any number of players.
+
+Large boards can use scipy.sparse matrices; scipy is optional and only
+needed when sparse=True (or when the board is large enough for the
+analyzer to pick sparse storage itself).
+"""
+import sys
+import time
+
+import numpy as np
+
+from board import DEFAULT_BOARD, load_board
+from engine import Engine, DICE_SIDES
+
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:  # pragma: no cover - scipy is optional
+    scipy = None
+
+# Boards with more cells than this use sparse matrices by default
+SPARSE_THRESHOLD = 1000
+
+# Analyzers keyed by (board hash, sides), see get_analyzer
+_analyzers = {}
+
+
+def get_analyzer(board=DEFAULT_BOARD, sides=DICE_SIDES):
+    """Return a shared analyzer for a board, built once per board hash"""
+    key = (board.hash, sides)
+    analyzer = _analyzers.get(key)
+    if analyzer is None:
+        analyzer = _analyzers[key] = MarkovAnalyzer(Engine(board, sides))
+    return analyzer
+
+
+class MarkovAnalyzer:
+    def __init__(self, engine=None, sparse=None, tol=1e-12, max_turns=100000):
+        if engine is None:
+            engine = Engine()
+        if sparse is None:
+            sparse = scipy is not None and engine.win_cell > SPARSE_THRESHOLD
+        if sparse and scipy is None:
+            raise ImportError("sparse analysis requires scipy")
+
+        self.engine = engine
+        self.sparse = sparse
+        self.tol = tol
+        self.max_turns = max_turns
+        self.transition_matrix = self.build_transition_matrix()
+        self._turn_distribution = None
+
+    def build_transition_matrix(self):
+        """Build the (WIN_CELL + 1) square single-player transition matrix"""
+        engine = self.engine
+        size = engine.win_cell + 1
+        probability = 1.0 / engine.sides
+
+        rows, cols = [], []
+        for position in range(engine.win_cell):
+            for roll in range(1, engine.sides + 1):
+                rows.append(position)
+                cols.append(engine.move(position, roll))
+        data = [probability] * len(rows)
+
+        # The win cell is absorbing
+        rows.append(engine.win_cell)
+        cols.append(engine.win_cell)
+        data.append(1.0)
+
+        if self.sparse:
+            # Duplicate (row, col) entries are summed on conversion
+            return scipy.sparse.coo_matrix((data, (rows, cols)), shape=(size, size)).tocsr()
+
+        matrix = np.zeros((size, size))
+        np.add.at(matrix, (rows, cols), data)
+        return matrix
+
+    def expected_turns_from(self):
+        """Expected number of rolls to finish from every non-winning cell"""
+        win_cell = self.engine.win_cell
+        matrix = self.transition_matrix
+        ones = np.ones(win_cell)
+
+        # Solve (I - Q) x = 1 over the transient cells
+        if self.sparse:
+            q = matrix[:win_cell, :win_cell]
+            identity = scipy.sparse.identity(win_cell, format="csr")
+            return scipy.sparse.linalg.spsolve((identity - q).tocsc(), ones)
+
+        q = matrix[:win_cell, :win_cell]
+        return np.linalg.solve(np.eye(win_cell) - q, ones)
+
+    def expected_turns(self):
+        """Expected number of rolls for one player to finish from the start"""
+        return float(self.expected_turns_from()[0])
+
+    def turn_distribution(self):
+        """Probability that one player finishes on exactly roll t, indexed by t"""
+        if self._turn_distribution is not None:
+            return self._turn_distribution
+
+        win_cell = self.engine.win_cell
+        # Propagate the row vector v <- v P as P^T v
+        transposed = self.transition_matrix.T
+        if self.sparse:
+            transposed = transposed.tocsr()
+
+        state = np.zeros(win_cell + 1)
+        state[0] = 1.0
+        finished = [0.0]
+        for _ in range(self.max_turns):
+            state = transposed @ state
+            finished.append(state[win_cell])
+            # Sum the unfinished mass directly; 1 - finished loses precision
+            if state[:win_cell].sum() < self.tol:
+                break
+
+        self._turn_distribution = np.diff(np.array(finished), prepend=0.0)
+        return self._turn_distribution
+
+    def survival(self):
+        """Probability that one player has not finished after t rolls"""
+        return 1.0 - np.cumsum(self.turn_distribution())
+
+    def _seat_terms(self, num_players):
+        """P(seat i wins on its t-th roll) as a (num_players, turns) array"""
+        finish = self.turn_distribution()
+        survival = np.clip(self.survival(), 0.0, 1.0)
+        before = np.concatenate(([1.0], survival[:-1]))
+
+        # Seats ahead of i have rolled t times, seats behind it t - 1 times
+        seats = np.arange(num_players)[:, None]
+        return finish * survival ** seats * before ** (num_players - 1 - seats)
+
+    def win_probabilities(self, num_players=2):
+        """Exact probability that each seat wins"""
+        return self._seat_terms(num_players).sum(axis=1)
+
+    def game_length_distribution(self, num_players=2):
+        """Probability that a game lasts exactly n total rolls, indexed by n"""
+        terms = self._seat_terms(num_players)
+        turns = terms.shape[1]
+        lengths = np.zeros(turns * num_players + 1)
+        for seat in range(num_players):
+            # Seat i finishing on its t-th roll ends the game at roll (t - 1) * P + i + 1
+            rolls = (np.arange(1, turns) - 1) * num_players + seat + 1
+            lengths[rolls] += terms[seat, 1:]
+        return lengths
+
+    def expected_game_length(self, num_players=2):
+        """Expected total number of rolls in a game"""
+        lengths = self.game_length_distribution(num_players)
+        return float(np.dot(np.arange(len(lengths)), lengths))
+
+
+if __name__ == "__main__":
+    sparse = True if "--sparse" in sys.argv else None
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    board = load_board(paths[0]) if paths else DEFAULT_BOARD
+    start = time.perf_counter()
+    analyzer = MarkovAnalyzer(Engine(board), sparse=sparse)
+    print(f"Expected turns for one player: {analyzer.expected_turns():.4f}")
+    for num_players in range(2, 5):
+        rates = analyzer.win_probabilities(num_players)
+        length = analyzer.expected_game_length(num_players)
+        print(f"{num_players} players: win {', '.join(f'{r:.4f}' for r in rates)}"
+              f" - mean length {length:.2f} rolls")
+    print(f"Analysis took {(time.perf_counter() - start) * 1000:.1f} ms")
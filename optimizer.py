@@ -0,0 +1,257 @@
+"""Search for balanced boards by mutating snakes and ladders.
+
+Starting from a board, every generation proposes variants that move, add or
+remove one snake or ladder, scores them across a process pool and keeps the
+best if it gets closer to the targets (mean game length, its standard
+deviation and the first player's advantage). Scores are exact Markov
+statistics by default, or batched Monte Carlo estimates with --method batch,
+and are cached by board hash so no board is ever evaluated twice.
+
+    python optimizer.py --length 45 --std 25 --generations 40 --out boards/season.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batch import simulate_batch
+from board import DEFAULT_BOARD, Board, BoardError, load_board
+from engine import Engine
+from markov import MarkovAnalyzer
+
+# Probability mass allowed to remain unfinished in an exact evaluation
+UNFINISHED_TOL = 1e-6
+
+
+def evaluate_exact(board, num_players=2):
+    """Exact length statistics and win rates from the Markov chain"""
+    analyzer = MarkovAnalyzer(Engine(board))
+    # Mass the analyzer never saw finish means the statistics would be wrong
+    if 1.0 - analyzer.turn_distribution().sum() > UNFINISHED_TOL:
+        return None
+    lengths = analyzer.game_length_distribution(num_players)
+    rolls = np.arange(len(lengths))
+    mean = np.dot(rolls, lengths)
+    variance = np.dot((rolls - mean) ** 2, lengths)
+    return {
+        "mean_length": float(mean),
+        "std_length": math.sqrt(variance),
+        "win_rates": analyzer.win_probabilities(num_players).tolist(),
+    }
+
+
+def evaluate_batch(board, num_players=2, games=20000, seed=0):
+    """Monte Carlo estimates of the same statistics
+
+    Every board is played with the same seed, so differences between
+    candidates are not drowned in sampling noise.
+    """
+    result = simulate_batch(games, num_players, seed=seed, engine=Engine(board))
+    return {
+        "mean_length": float(result.turns.mean()),
+        "std_length": float(result.turns.std()),
+        "win_rates": result.win_rates().tolist(),
+    }
+
+
+def evaluate(job):
+    """Pool entry point: score one (board, method, num_players, games) job
+
+    Returns None for exact jobs on boards where players can fail to finish.
+    """
+    board, method, num_players, games = job
+    if method == "batch":
+        return evaluate_batch(board, num_players, games)
+    return evaluate_exact(board, num_players)
+
+
+class Targets:
+    """Desired statistics and how much each one counts"""
+
+    def __init__(self, mean_length=None, std_length=None, advantage=0.0,
+                 length_weight=1.0, std_weight=1.0, advantage_weight=10.0):
+        self.mean_length = mean_length
+        self.std_length = std_length
+        self.advantage = advantage
+        self.length_weight = length_weight
+        self.std_weight = std_weight
+        self.advantage_weight = advantage_weight
+
+    def cost(self, score):
+        """Weighted squared error of a score; 0 hits every target"""
+        if score is None:
+            # Unscorable boards are never kept
+            return math.inf
+        cost = 0.0
+        if self.mean_length is not None:
+            error = (score["mean_length"] - self.mean_length) / self.mean_length
+            cost += self.length_weight * error ** 2
+        if self.std_length is not None:
+            error = (score["std_length"] - self.std_length) / self.std_length
+            cost += self.std_weight * error ** 2
+        if self.advantage is not None:
+            error = advantage(score) - self.advantage
+            cost += self.advantage_weight * error ** 2
+        return cost
+
+
+def advantage(score):
+    """How much more often the first seat wins than a fair share"""
+    rates = score["win_rates"]
+    return rates[0] - 1.0 / len(rates)
+
+
+class ScoreCache:
+    """Scores keyed by board hash, optionally persisted as JSON"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.scores = {}
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.scores = json.load(f)
+
+    def key(self, board, method, num_players, games):
+        # Monte Carlo scores also depend on how many games were played
+        if method == "batch":
+            method = f"batch{games}"
+        return f"{board.hash}:{method}:{num_players}"
+
+    def evaluate(self, boards, pool=None, method="exact", num_players=2, games=20000):
+        """Score boards, running only the ones not seen before"""
+        missing = {}
+        for board in boards:
+            key = self.key(board, method, num_players, games)
+            if key in self.scores or key in missing:
+                self.hits += 1
+            else:
+                self.misses += 1
+                missing[key] = board
+
+        jobs = [(board, method, num_players, games) for board in missing.values()]
+        results = pool.map(evaluate, jobs, chunksize=4) if pool else map(evaluate, jobs)
+        for key, score in zip(missing, results):
+            self.scores[key] = score
+        return [self.scores[self.key(board, method, num_players, games)] for board in boards]
+
+    def save(self):
+        if self.path:
+            with open(self.path, "w") as f:
+                json.dump(self.scores, f)
+
+
+def mutate(board, rng, max_length=None, attempts=100):
+    """Return a valid copy of board with one snake or ladder moved, added or removed"""
+    if max_length is None:
+        max_length = 3 * board.columns
+    size = board.size
+
+    for _ in range(attempts):
+        snakes, ladders = dict(board.snakes), dict(board.ladders)
+        action = rng.choice(("move", "move", "add", "remove"))
+        jumps = rng.choice((snakes, ladders))
+        if action != "add" and not jumps:
+            continue
+
+        if action == "remove":
+            del jumps[rng.choice(list(jumps))]
+        elif action == "add":
+            start = rng.randint(2, size - 1)
+            length = rng.randint(1, max_length)
+            # Snakes go down, ladders go up
+            end = start - length if jumps is snakes else start + length
+            jumps[start] = end
+        else:
+            start = rng.choice(list(jumps))
+            end = jumps.pop(start)
+            shift = rng.randint(-board.columns, board.columns)
+            if rng.random() < 0.5:
+                start += shift
+            else:
+                end += shift
+            jumps[start] = end
+
+        # Board rejects overlaps, chains, cycles and boards that cannot be won
+        try:
+            return Board(snakes, ladders, size, board.columns, board.name)
+        except BoardError:
+            continue
+    return board
+
+
+def optimize(board, targets, generations=30, population=64, method="exact",
+             num_players=2, games=20000, workers=None, seed=0, cache=None, report=None):
+    """Hill-climb from board towards targets and return (best_board, best_score)"""
+    rng = random.Random(seed)
+    if cache is None:
+        cache = ScoreCache()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    options = {"method": method, "num_players": num_players, "games": games}
+
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        best_score = cache.evaluate([board], pool, **options)[0]
+        if best_score is None:
+            raise BoardError(f"cannot score the starting board {board}")
+        best_cost = targets.cost(best_score)
+        for generation in range(generations):
+            candidates = [mutate(board, rng) for _ in range(population)]
+            scores = cache.evaluate(candidates, pool, **options)
+            costs = [targets.cost(score) for score in scores]
+            index = min(range(len(candidates)), key=costs.__getitem__)
+            if costs[index] < best_cost:
+                board, best_score, best_cost = candidates[index], scores[index], costs[index]
+            if report is not None:
+                report(generation, board, best_score, best_cost)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return board, best_score
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search for boards that hit balance targets")
+    parser.add_argument("board", nargs="?", help="starting board file (default: classic)")
+    parser.add_argument("--length", type=float, help="target mean game length in rolls")
+    parser.add_argument("--std", type=float, help="target standard deviation of game length")
+    parser.add_argument("--advantage", type=float, default=0.0, help="target first-seat advantage")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--population", type=int, default=64)
+    parser.add_argument("--method", choices=("exact", "batch"), default="exact")
+    parser.add_argument("--games", type=int, default=20000, help="games per board with --method batch")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", help="JSON file to load and save scores")
+    parser.add_argument("--out", help="write the best board to this file")
+    args = parser.parse_args()
+
+    start_board = load_board(args.board) if args.board else DEFAULT_BOARD
+    targets = Targets(args.length, args.std, args.advantage)
+    cache = ScoreCache(args.cache)
+
+    def report(generation, board, score, cost):
+        print(f"gen {generation + 1:3d}: cost {cost:.5f} - length {score['mean_length']:.2f}"
+              f" +/- {score['std_length']:.2f}, advantage {advantage(score):+.4f} - {board}")
+
+    start = time.perf_counter()
+    best, score = optimize(
+        start_board, targets, args.generations, args.population, args.method,
+        args.players, args.games, args.workers, args.seed, cache, report
+    )
+    elapsed = time.perf_counter() - start
+    cache.save()
+
+    print(f"{cache.misses} boards evaluated, {cache.hits} cache hits in {elapsed:.1f}s"
+          f" ({cache.misses / elapsed * 60:,.0f} evaluations/min)")
+    if args.out:
+        best.save(args.out)
+        print(f"Best board written to {args.out}")
@@ -0,0 +1,125 @@
+"""Pooled, array-backed particle system.
+
+Particles live in preallocated struct-of-arrays NumPy storage with a free
+list, so spawning and expiring them never allocates Python objects, and
+every simulation step is advanced with a handful of vectorized operations.
+Drawing uses a small cache of pre-rendered alpha sprites binned by color,
+radius and alpha.
+"""
+import numpy as np
+import pygame
+
+# Number of alpha levels sprites are quantized to
+ALPHA_BINS = 16
+
+
+class ParticleSystem:
+    def __init__(self, capacity=4096, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = {}
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """(Re)allocate storage for capacity particles, keeping live ones"""
+        old = getattr(self, "alive", None)
+        fields = {
+            "x": np.float32, "y": np.float32,
+            "speed_x": np.float32, "speed_y": np.float32,
+            "life": np.float32, "size": np.float32,
+            "color": np.int16, "alive": np.bool_,
+        }
+        for name, dtype in fields.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:len(old)] = getattr(self, name)
+            setattr(self, name, array)
+
+        start = 0 if old is None else len(old)
+        free = list(range(capacity - 1, start - 1, -1))
+        self.free = free if old is None else free + self.free
+        self.capacity = capacity
+
+    @property
+    def count(self):
+        return self.capacity - len(self.free)
+
+    def color_id(self, color):
+        """Index of color in the palette, adding it on first use"""
+        index = self.palette_index.get(color)
+        if index is None:
+            index = self.palette_index[color] = len(self.palette)
+            self.palette.append(color)
+        return index
+
+    def spawn(self, x, y, color, count):
+        """Emit count particles from (x, y)"""
+        if count > len(self.free):
+            self.allocate(max(self.capacity * 2, self.count + count))
+        slots = np.array(self.free[-count:], dtype=np.intp)
+        del self.free[-count:]
+
+        rng = self.rng
+        self.x[slots] = x
+        self.y[slots] = y
+        self.speed_x[slots] = rng.uniform(-3, 3, count)
+        self.speed_y[slots] = rng.uniform(-3, 3, count)
+        self.life[slots] = rng.uniform(0.5, 1.5, count)
+        self.size[slots] = rng.integers(2, 6, count)
+        self.color[slots] = self.color_id(color)
+        self.alive[slots] = True
+
+    def update(self):
+        """Advance every live particle by one simulation step and recycle dead ones"""
+        if not self.count:
+            return
+        live = np.flatnonzero(self.alive)
+        self.x[live] += self.speed_x[live]
+        self.y[live] += self.speed_y[live]
+        self.life[live] -= 0.03
+        self.size[live] -= 0.1
+
+        dead = live[(self.life[live] <= 0) | (self.size[live] <= 0)]
+        if len(dead):
+            self.alive[dead] = False
+            self.free.extend(dead.tolist())
+
+    def sprite(self, color_id, radius, alpha_bin):
+        """Pre-rendered circle sprite for a (color, radius, alpha) bin"""
+        key = (color_id, radius, alpha_bin)
+        surf = self.sprites.get(key)
+        if surf is None:
+            r, g, b = self.palette[color_id]
+            alpha = min(255, alpha_bin * 256 // ALPHA_BINS + 256 // ALPHA_BINS // 2)
+            surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (r, g, b, alpha), (radius, radius), radius)
+            self.sprites[key] = surf
+        return surf
+
+    def draw(self, screen, offset=(0, 0)):
+        """Blit every live particle, shifted by offset, and return the rects touched"""
+        if not self.count:
+            return []
+        live = np.flatnonzero(self.alive)
+        size = self.size[live]
+        radius = size.astype(np.int32)
+        alpha = np.clip(self.life[live] * 255, 0, 255).astype(np.int32)
+        alpha_bin = alpha * ALPHA_BINS // 256
+        left = (self.x[live] - size + offset[0]).astype(np.int32)
+        top = (self.y[live] - size + offset[1]).astype(np.int32)
+        colors = self.color[live]
+
+        sprite = self.sprite
+        blits = [
+            (sprite(c, r, a), (lx, ty))
+            for c, r, a, lx, ty in zip(
+                colors.tolist(), radius.tolist(), alpha_bin.tolist(), left.tolist(), top.tolist()
+            )
+            if r > 0
+        ]
+        return screen.blits(blits)
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
@@ -0,0 +1,137 @@
+"""Lightweight per-phase frame profiler.
+
+Hot paths wrap their work in ``with profiler.phase("name"):``. While the
+profiler is disabled, phase() hands back one shared do-nothing context
+manager, so instrumentation can stay in production builds. While enabled,
+each phase keeps a rolling window of samples from which p50/p95/p99 are
+computed on demand, and the results can be drawn as an overlay or dumped
+to CSV or JSON.
+"""
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+from fonts import get_font, render_text
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("samples", "start")
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.start)
+        return False
+
+
+def percentile(sorted_samples, p):
+    return sorted_samples[min(len(sorted_samples) - 1, int(p * len(sorted_samples)))]
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=600, overlay_refresh=30):
+        self.enabled = enabled
+        self.window = window
+        self.phases = {}
+        # Overlay text is recomputed every overlay_refresh frames, not every frame
+        self.overlay_refresh = overlay_refresh
+        self.overlay_lines = []
+        self.frames = 0
+
+    def phase(self, name):
+        """Context manager timing one phase of the frame"""
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase(self.window)
+        return phase
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.overlay_lines = []
+
+    def end_frame(self):
+        if self.enabled:
+            self.frames += 1
+
+    def stats(self):
+        """Per-phase timings in milliseconds"""
+        result = {}
+        for name, phase in self.phases.items():
+            samples = sorted(phase.samples)
+            if not samples:
+                continue
+            result[name] = {
+                "count": len(samples),
+                "mean_ms": sum(samples) / len(samples) * 1000,
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p95_ms": percentile(samples, 0.95) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+            }
+        return result
+
+    def dump_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def dump_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            columns = ["mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+            writer.writerow(["phase", "count"] + columns)
+            for name, row in self.stats().items():
+                writer.writerow([name, row["count"]] + [f"{row[c]:.4f}" for c in columns])
+
+    def dump(self, path):
+        """Write stats as CSV or JSON depending on the file extension"""
+        if path.endswith(".csv"):
+            self.dump_csv(path)
+        else:
+            self.dump_json(path)
+
+    def draw_overlay(self, screen, x=20, y=60):
+        """Draw a p50/p95/p99 table and return the rect touched"""
+        if not self.overlay_lines or self.frames % self.overlay_refresh == 0:
+            self.overlay_lines = [("phase", "p50", "p95", "p99")] + [
+                (name, f"{row['p50_ms']:.3f}", f"{row['p95_ms']:.3f}", f"{row['p99_ms']:.3f}")
+                for name, row in self.stats().items()
+            ]
+
+        # Columns are laid out explicitly so any font lines up
+        font = get_font('arial', 13)
+        line_height = font.get_linesize()
+        name_width, value_width = 90, 56
+        width = name_width + value_width * 3 + 16
+        height = line_height * len(self.overlay_lines) + 12
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, columns in enumerate(self.overlay_lines):
+            row_y = 6 + i * line_height
+            panel.blit(render_text(font, columns[0], (255, 255, 255)), (8, row_y))
+            for j, value in enumerate(columns[1:]):
+                text = render_text(font, value, (255, 255, 255))
+                right = 8 + name_width + value_width * (j + 1)
+                panel.blit(text, (right - text.get_width(), row_y))
+        return screen.blit(panel, (x, y))
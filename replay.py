@@ -0,0 +1,244 @@
+"""Seeded move logs and fast-forward replay.
+
+Every game carries a seed, and its dice are rolled from random.Random(seed)
+with engine.roll_die, so the seed alone fixes every roll. Games can also
+write a JSONL move log: a header line followed by one line per roll.
+
+    {"seed": 1234, "board": "<board hash>", "name": "classic", "players": 2, "sides": 6}
+    {"turn": 1, "seat": 0, "roll": 4, "from": 0, "to": 14, "hit": "ladder", "bounce": false}
+
+Games played with variants.Rules that give choices add "rules" to the
+header, and replay checks each move is one those rules offered.
+
+Replay reads a log one line at a time and applies it to the engine without
+any animation, so the state at turn N costs O(N) and ingesting thousands of
+logs never holds more than one line in memory.
+
+    python replay.py logs/game-1234.jsonl --turn 20
+    python replay.py --ingest logs/
+"""
+import json
+import os
+import random
+import sys
+import time
+
+from board import DEFAULT_BOARD, load_board
+from engine import DICE_SIDES, HIT_LADDER, HIT_NONE, HIT_SNAKE, Engine, GameResult
+from farm import Histograms
+from variants import Rules
+
+HIT_NAMES = {HIT_NONE: None, HIT_SNAKE: "snake", HIT_LADDER: "ladder"}
+HIT_TYPES = {name: hit for hit, name in HIT_NAMES.items()}
+
+
+class ReplayError(ValueError):
+    """Raised for logs that do not match their board, seed or rules"""
+
+
+class BoardMismatch(ReplayError):
+    """Raised for logs recorded on a different board than the one given"""
+
+
+class GameLog:
+    """Append-only JSONL move log for one game"""
+
+    def __init__(self, path, seed, board=DEFAULT_BOARD, num_players=2, sides=DICE_SIDES,
+                 rules=None):
+        self.path = path
+        self.turns = 0
+        self.file = open(path, "w")
+        header = {
+            "seed": seed,
+            "board": board.hash,
+            "name": board.name,
+            "players": num_players,
+            "sides": sides,
+        }
+        if rules is not None and rules.has_choices:
+            header["rules"] = rules.to_dict()
+        self.write(header)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def record(self, seat, roll, start, end, hit, bounced):
+        """Log one roll as resolved by Engine.resolve"""
+        self.turns += 1
+        self.write({
+            "turn": self.turns,
+            "seat": seat,
+            "roll": roll,
+            "from": start,
+            "to": end,
+            "hit": HIT_NAMES[hit],
+            "bounce": bool(bounced),
+        })
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+def read_log(path):
+    """Yield the header and then every turn record of a log, one line at a time"""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+class ReplayState:
+    """Game state rebuilt from a log without animation"""
+
+    def __init__(self, header, engine):
+        self.header = header
+        self.engine = engine
+        self.seed = header["seed"]
+        self.positions = [0] * header["players"]
+        self.turn = 0
+        self.seat = 0
+        self.winner = None
+        self.snake_hits = 0
+        self.ladder_hits = 0
+        self.bounces = 0
+        self.rules = Rules.from_dict(header.get("rules", {}))
+        # Re-rolling from the seed checks every logged roll
+        self.rng = random.Random(self.seed)
+
+    def apply(self, record):
+        """Apply one turn record, checking it against the seed and the rules"""
+        turn = self.turn + 1
+        if self.winner is not None:
+            raise ReplayError(f"turn {turn} comes after the game was won")
+        if record["seat"] != self.seat or record["from"] != self.positions[self.seat]:
+            raise ReplayError(f"turn {turn} does not continue from the previous state")
+
+        roll = record["roll"]
+        rolls = self.rules.roll(self.rng, self.engine.sides)
+        if roll not in rolls:
+            raise ReplayError(f"turn {turn} rolled {roll}, which seed {self.seed} does not give")
+        # The logged move must be one the rules offered for this roll
+        options = self.rules.options(self.engine, record["from"], rolls)
+        move = next((o for o in options if o.roll == roll and o.to == record["to"]), None)
+        if move is None or move.hit != HIT_TYPES[record["hit"]]:
+            allowed = sorted(option.to for option in options)
+            raise ReplayError(f"turn {turn} moved to {record['to']}, the rules allow {allowed}")
+        if record["bounce"] != bool(move.bounced):
+            raise ReplayError(f"turn {turn} logs bounce={record['bounce']}, the rules give"
+                              f" {bool(move.bounced)}")
+        new_pos, hit, bounced = move.to, move.hit, move.bounced
+
+        self.turn = turn
+        self.positions[self.seat] = new_pos
+        self.snake_hits += hit == HIT_SNAKE
+        self.ladder_hits += hit == HIT_LADDER
+        self.bounces += bounced
+        if new_pos == self.engine.win_cell:
+            self.winner = self.seat
+        else:
+            self.seat = (self.seat + 1) % len(self.positions)
+
+    def result(self):
+        """The engine.GameResult of a finished game, None while unfinished"""
+        if self.winner is None:
+            return None
+        return GameResult(self.winner, self.turn, self.snake_hits, self.ladder_hits, self.bounces)
+
+
+def replay(path, turn=None, board=DEFAULT_BOARD, engines=None):
+    """Rebuild the state of a logged game after `turn` rolls, or at its end
+
+    engines optionally maps dice sides to prebuilt engines for the board.
+    """
+    records = read_log(path)
+    try:
+        header = next(records)
+    except StopIteration:
+        raise ReplayError(f"{path} is empty") from None
+    if header["board"] != board.hash:
+        # Names are cosmetic, so name the hashes too
+        raise BoardMismatch(f"{path} was played on board {header['name']!r}"
+                            f" ({header['board'][:12]}), not {board.name!r} ({board.hash[:12]})")
+
+    if engines is None:
+        engines = {}
+    sides = header["sides"]
+    engine = engines.get(sides)
+    if engine is None:
+        engine = engines[sides] = Engine(board, sides)
+
+    state = ReplayState(header, engine)
+    for record in records:
+        if turn is not None and state.turn >= turn:
+            break
+        state.apply(record)
+    records.close()
+    return state
+
+
+def log_paths(paths):
+    """Expand files and directories of *.jsonl logs lazily, in sorted order"""
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".jsonl"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def ingest(paths, board=DEFAULT_BOARD, skipped=None):
+    """Replay every finished game under paths into a farm.Histograms
+
+    Logs from other boards are left out; if skipped is a list, their
+    BoardMismatch errors are appended to it.
+    """
+    histograms = Histograms()
+    # Engine tables are built once, not once per log
+    engines = {}
+    for path in log_paths(paths):
+        try:
+            state = replay(path, board=board, engines=engines)
+        except BoardMismatch as error:
+            if skipped is not None:
+                skipped.append(error)
+            continue
+        result = state.result()
+        # Games abandoned before anyone won have no outcome to count
+        if result is not None:
+            histograms.add(result)
+    return histograms
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    board = DEFAULT_BOARD
+    if "--board" in args:
+        index = args.index("--board")
+        board = load_board(args[index + 1])
+        del args[index:index + 2]
+
+    if not args:
+        sys.exit("usage: python replay.py LOG [--turn N] | --ingest PATH... [--board FILE]")
+
+    start = time.perf_counter()
+    if args[0] == "--ingest":
+        skipped = []
+        histograms = ingest(args[1:], board, skipped)
+        elapsed = time.perf_counter() - start
+        for error in skipped:
+            print(f"Skipped {error}", file=sys.stderr)
+        print(f"{histograms.games} games in {elapsed:.2f}s")
+        print(f"Mean turns: {histograms.mean_turns():.2f}")
+        seats = max(histograms.winners, default=0) + 1
+        print(f"Win rates: {', '.join(f'{r:.4f}' for r in histograms.win_rates(seats))}")
+    else:
+        turn = int(args[args.index("--turn") + 1]) if "--turn" in args else None
+        state = replay(args[0], turn, board)
+        print(f"Seed {state.seed}, turn {state.turn}: positions {state.positions}")
+        if state.winner is not None:
+            print(f"Player {state.winner + 1} won")
+        else:
+            print(f"Player {state.seat + 1} to roll")
@@ -0,0 +1,322 @@
+"""Asyncio multiplayer server hosting many rooms in one process.
+
+Clients speak newline-delimited JSON over TCP. A client joins a room by
+name, creating it if needed, and the room starts once every seat is taken:
+
+    -> {"op": "join", "room": "lobby-1", "players": 2}
+    <- {"type": "joined", "room": "lobby-1", "seat": 0, "players": 2, "seed": 1234}
+    <- {"type": "start", "next": 0}
+    -> {"op": "roll"}
+    <- {"type": "turn", "turn": 1, "seat": 0, "roll": 4, "from": 0, "to": 14, "hit": "ladder", "bounce": false, "next": 1}
+
+Rooms apply the same engine rules as Game.update and broadcast only these
+turn deltas, encoded once per turn. Room state is a slotted state.GameState
+and every room shares the engine of its board. A seated two-player room
+costs about 6.6 KiB as measured by benchmarks/bench_server.py: about 3 KB
+for the room itself, most of it the random.Random seeded from the room seed
+that keeps its games replayable, and the rest its two connections. After a
+win, any player can send {"op": "rematch"} to play again with a fresh seed.
+
+With --log-dir every game writes a replay.GameLog named after its seed, so
+server games replay with replay.py like local ones. Each room keeps its log
+file open while the game runs.
+
+    python server.py [--host 127.0.0.1] [--port 8765] [--board FILE] [--log-dir DIR]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+
+from board import DEFAULT_BOARD, load_board
+from engine import Engine, roll_die
+from replay import HIT_NAMES, GameLog
+from state import GameState
+
+MAX_ROOM_PLAYERS = 64
+# Longest request line accepted from a client
+MAX_LINE = 1024
+# Clients whose unsent output grows past this are too slow and get dropped
+MAX_BUFFER = 64 * 1024
+# Pending connections the OS queues; the default of 100 drops bursts of joins
+BACKLOG = 4096
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class Room:
+    __slots__ = ("name", "engine", "rng", "state", "clients", "log")
+
+    def __init__(self, name, engine, size, seed):
+        self.name = name
+        self.engine = engine
+        self.state = GameState(size, seed)
+        self.rng = random.Random(seed)
+        # Connections in seat order
+        self.clients = []
+        # replay.GameLog of the running game when the server keeps logs
+        self.log = None
+
+    @property
+    def size(self):
+        return self.state.num_players
+
+    @property
+    def seed(self):
+        return self.state.seed
+
+    @property
+    def winner(self):
+        return self.state.winner
+
+    @property
+    def seat(self):
+        return self.state.seat
+
+    @property
+    def full(self):
+        return len(self.clients) == self.size
+
+    def reset(self, seed):
+        """Start a new game in the same room with the same players"""
+        self.close_log()
+        self.state.reset(seed)
+        self.rng = random.Random(seed)
+
+    def close_log(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def roll(self):
+        """Roll for the seat to move and return the turn delta"""
+        state = self.state
+        seat = state.seat
+        roll = roll_die(self.rng, self.engine.sides)
+        start, new_pos, hit, bounced = state.move(self.engine, roll)
+        if self.log is not None:
+            self.log.record(seat, roll, start, new_pos, hit, bounced)
+        delta = {
+            "type": "turn",
+            "turn": state.turn,
+            "seat": seat,
+            "roll": roll,
+            "from": start,
+            "to": new_pos,
+            "hit": HIT_NAMES[hit],
+            "bounce": bool(bounced),
+        }
+        if state.winner is not None:
+            delta["winner"] = seat
+            self.close_log()
+        else:
+            delta["next"] = state.seat
+        return delta
+
+
+class Connection(asyncio.Protocol):
+    """One client socket, parsed line by line without a task per client"""
+    __slots__ = ("server", "transport", "buffer", "room")
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = bytearray()
+        self.room = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        buffer = self.buffer
+        buffer += data
+        while True:
+            end = buffer.find(b"\n")
+            if end < 0:
+                break
+            line = bytes(buffer[:end])
+            del buffer[:end + 1]
+            self.server.handle_line(self, line)
+        if len(buffer) > MAX_LINE:
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.server.leave(self)
+
+    def send(self, data):
+        # Slow readers are dropped instead of buffering without bound
+        if self.transport.get_write_buffer_size() > MAX_BUFFER:
+            self.transport.close()
+        else:
+            self.transport.write(data)
+
+
+class GameServer:
+    def __init__(self, board=DEFAULT_BOARD, seed=None, log_dir=None):
+        self.board = board
+        self.engine = Engine(board)
+        self.rooms = {}
+        self.log_dir = log_dir
+        if log_dir is not None:
+            os.makedirs(log_dir, exist_ok=True)
+        # Room seeds come from one seeded sequence, like Game seeds
+        self.seeds = random.Random(seed)
+        self.server = None
+
+    def broadcast(self, room, message):
+        """Send one encoded message to everyone in a room"""
+        data = encode(message)
+        for connection in room.clients:
+            connection.send(data)
+
+    def open_log(self, room):
+        """Start logging the room's new game when the server keeps logs"""
+        if self.log_dir is not None:
+            path = os.path.join(self.log_dir, f"server-{room.seed}.jsonl")
+            room.log = GameLog(path, room.seed, self.board, room.size, self.engine.sides)
+
+    def join(self, connection, request):
+        """Seat a client in a room, creating the room on first join"""
+        if connection.room is not None:
+            return {"type": "error", "message": "already in a room"}
+        name = str(request.get("room", ""))[:64]
+        room = self.rooms.get(name)
+        if room is None:
+            size = request.get("players", 2)
+            # bool is an int subclass, so "players": true would mean one seat
+            if (not isinstance(size, int) or isinstance(size, bool)
+                    or not 1 <= size <= MAX_ROOM_PLAYERS):
+                return {"type": "error", "message": f"players must be 1-{MAX_ROOM_PLAYERS}"}
+            room = self.rooms[name] = Room(name, self.engine, size, self.seeds.getrandbits(32))
+        if room.full:
+            return {"type": "error", "message": f"room {name!r} is full"}
+
+        room.clients.append(connection)
+        connection.room = room
+        connection.send(encode({"type": "joined", "room": name, "seat": len(room.clients) - 1,
+                                "players": room.size, "seed": room.seed}))
+        if room.full:
+            self.open_log(room)
+            self.broadcast(room, {"type": "start", "next": 0})
+        return None
+
+    def leave(self, connection):
+        """Close a room when anyone leaves; seats would shift under the others"""
+        room = connection.room
+        if room is None:
+            return
+        connection.room = None
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+        # The log keeps the abandoned game up to its last turn
+        room.close_log()
+        if connection in room.clients:
+            room.clients.remove(connection)
+        if room.clients:
+            self.broadcast(room, {"type": "closed", "message": "a player left"})
+            for other in room.clients:
+                other.room = None
+                other.transport.close()
+            room.clients.clear()
+
+    def handle_request(self, connection, request):
+        """Apply one request and return the error to send back, if any"""
+        op = request.get("op")
+        if op == "join":
+            return self.join(connection, request)
+        room = connection.room
+        if room is None:
+            return {"type": "error", "message": "join a room first"}
+        if op == "roll":
+            if not room.full:
+                return {"type": "error", "message": "waiting for players"}
+            if room.winner is not None:
+                return {"type": "error", "message": "game over, send rematch"}
+            if room.clients[room.seat] is not connection:
+                return {"type": "error", "message": "not your turn"}
+            self.broadcast(room, room.roll())
+        elif op == "rematch":
+            if room.winner is None:
+                return {"type": "error", "message": "game still running"}
+            room.reset(self.seeds.getrandbits(32))
+            self.open_log(room)
+            self.broadcast(room, {"type": "start", "next": 0, "seed": room.seed})
+        else:
+            return {"type": "error", "message": f"unknown op {op!r}"}
+        return None
+
+    def handle_line(self, connection, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict):
+            error = {"type": "error", "message": "expected a JSON object"}
+        else:
+            error = self.handle_request(connection, request)
+        if error is not None:
+            connection.send(encode(error))
+
+    async def start(self, host="127.0.0.1", port=8765):
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            lambda: Connection(self), host, port, backlog=BACKLOG
+        )
+        return self.server
+
+    async def serve_forever(self, host="127.0.0.1", port=8765):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class Client:
+    """Minimal line-protocol client for tests, bots and benchmarks"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    def send(self, **request):
+        self.writer.write(encode(request))
+
+    async def receive(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    async def receive_type(self, message_type):
+        """Skip messages until one of the given type arrives"""
+        while True:
+            message = await self.receive()
+            if message["type"] == message_type:
+                return message
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host Snake and Ladders rooms over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--board", help="board file for every room (default: classic)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log-dir", help="write a replay log of every game here")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+    try:
+        asyncio.run(GameServer(board, args.seed, args.log_dir).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
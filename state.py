@@ -0,0 +1,182 @@
+"""Compact game state for servers and simulations.
+
+GameState keeps only what the rules need: the seed, the turn count, the
+seat to move, the winner and every player's cell. It is slotted, keeps
+positions in an array rather than a list of ints, and packs into
+11 + 4 * players bytes, so a two-player game is 19 bytes.
+
+GameTable holds many games of the same size in struct-of-arrays NumPy
+storage with a free list, like particles.ParticleSystem, so a million live
+two-player games take under 30 MB and can all be advanced in one
+vectorized step.
+"""
+import struct
+from array import array
+
+import numpy as np
+
+# seed, turn, seat, winner (NO_WINNER while running), number of players
+HEADER = struct.Struct("<IIBBB")
+NO_WINNER = 255
+
+
+class GameState:
+    __slots__ = ("seed", "turn", "seat", "winner", "positions")
+
+    def __init__(self, num_players=2, seed=0):
+        self.positions = array("I", bytes(4 * num_players))
+        self.reset(seed)
+
+    def __repr__(self):
+        return (f"GameState(seed={self.seed}, turn={self.turn}, seat={self.seat}, "
+                f"winner={self.winner}, positions={self.positions.tolist()})")
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.pack() == other.pack()
+
+    @property
+    def num_players(self):
+        return len(self.positions)
+
+    def reset(self, seed=0):
+        """Put every player back at the start for a new game"""
+        self.seed = seed
+        self.turn = 0
+        self.seat = 0
+        self.winner = None
+        for seat in range(len(self.positions)):
+            self.positions[seat] = 0
+
+    def move(self, engine, roll):
+        """Apply one roll for the seat to move; returns (from, to, hit, bounced)"""
+        if self.winner is not None:
+            raise ValueError("the game is already over")
+        start = self.positions[self.seat]
+        new_pos, hit, bounced = engine.resolve(start, roll)
+
+        self.turn += 1
+        self.positions[self.seat] = new_pos
+        if new_pos == engine.win_cell:
+            self.winner = self.seat
+        else:
+            self.seat = (self.seat + 1) % len(self.positions)
+        return start, new_pos, hit, bounced
+
+    def pack(self):
+        """Serialize to a few dozen bytes"""
+        winner = NO_WINNER if self.winner is None else self.winner
+        count = len(self.positions)
+        header = HEADER.pack(self.seed, self.turn, self.seat, winner, count)
+        return header + struct.pack(f"<{count}I", *self.positions)
+
+    @classmethod
+    def unpack(cls, data):
+        seed, turn, seat, winner, num_players = HEADER.unpack_from(data)
+        state = cls(num_players, seed)
+        state.turn = turn
+        state.seat = seat
+        state.winner = None if winner == NO_WINNER else winner
+        state.positions = array("I", struct.unpack_from(f"<{num_players}I", data, HEADER.size))
+        return state
+
+
+class GameTable:
+    def __init__(self, capacity=1024, num_players=2):
+        self.num_players = num_players
+        self.capacity = 0
+        self.free_count = 0
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """(Re)allocate storage for capacity games, keeping live ones"""
+        old = self.capacity
+        fields = {
+            "seeds": (np.uint32, ()), "turns": (np.uint32, ()),
+            "seats": (np.uint8, ()), "winners": (np.uint8, ()),
+            "positions": (np.uint32, (self.num_players,)), "alive": (np.bool_, ()),
+        }
+        for name, (dtype, shape) in fields.items():
+            storage = np.zeros((capacity,) + shape, dtype=dtype)
+            if old:
+                storage[:old] = getattr(self, name)
+            setattr(self, name, storage)
+
+        # Free slots are a stack in a preallocated array, popped from the end
+        free = np.empty(capacity, dtype=np.int64)
+        if old:
+            free[:self.free_count] = self.free[:self.free_count]
+        new_slots = np.arange(capacity - 1, old - 1, -1)
+        free[self.free_count:self.free_count + len(new_slots)] = new_slots
+        self.free = free
+        self.free_count += len(new_slots)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.capacity - self.free_count
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in
+                   ("seeds", "turns", "seats", "winners", "positions", "alive", "free"))
+
+    def add(self, seed=0):
+        """Start a new game and return its slot"""
+        if not self.free_count:
+            self.allocate(self.capacity * 2)
+        self.free_count -= 1
+        slot = int(self.free[self.free_count])
+        self.seeds[slot] = seed
+        self.turns[slot] = 0
+        self.seats[slot] = 0
+        self.winners[slot] = NO_WINNER
+        self.positions[slot] = 0
+        self.alive[slot] = True
+        return slot
+
+    def remove(self, slot):
+        self.alive[slot] = False
+        self.free[self.free_count] = slot
+        self.free_count += 1
+
+    def get(self, slot):
+        """Copy one game out as a GameState"""
+        state = GameState(self.num_players, int(self.seeds[slot]))
+        state.turn = int(self.turns[slot])
+        state.seat = int(self.seats[slot])
+        winner = int(self.winners[slot])
+        state.winner = None if winner == NO_WINNER else winner
+        state.positions = array("I", self.positions[slot].tolist())
+        return state
+
+    def set(self, slot, state):
+        """Store a GameState into a slot"""
+        self.seeds[slot] = state.seed
+        self.turns[slot] = state.turn
+        self.seats[slot] = state.seat
+        self.winners[slot] = NO_WINNER if state.winner is None else state.winner
+        self.positions[slot] = state.positions
+
+    def step(self, jump, rng, sides=6):
+        """Roll once in every live, unfinished game
+
+        jump is batch.jump_table(engine) and rng a NumPy Generator. Returns the
+        slots that finished on this step.
+        """
+        win_cell = len(jump) - 1
+        active = np.flatnonzero(self.alive & (self.winners == NO_WINNER))
+        if not len(active):
+            return active
+        seats = self.seats[active]
+        rolls = rng.integers(1, sides + 1, size=len(active))
+
+        # Bounce back off the win cell, then apply snakes and ladders
+        landed = self.positions[active, seats].astype(np.int64) + rolls
+        landed = np.where(landed > win_cell, 2 * win_cell - landed, landed)
+        new_pos = jump[landed]
+
+        self.positions[active, seats] = new_pos
+        self.turns[active] += 1
+        finished = new_pos == win_cell
+        self.winners[active[finished]] = seats[finished]
+        self.seats[active] = np.where(finished, seats, (seats + 1) % self.num_players)
+        return active[finished]
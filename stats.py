@@ -0,0 +1,247 @@
+"""Game results and incrementally maintained aggregates in SQLite.
+
+Every finished interactive game is appended to the games table, and
+simulations add their farm.Histograms in one transaction. Each write also
+folds its counts into aggregate tables keyed by board hash, player count,
+rule variant (variants.Rules.key) and source:
+
+    totals   games, summed turns and squared turns, snake/ladder hits, bounces
+    wins     games won per seat
+    lengths  games per game length in turns
+
+so statistics never need a scan over individual games. A summary costs one
+query per aggregate table, and StatsStore.version changes with every write
+so the in-game panel only reloads after a new result.
+
+    python stats.py stats.db [--board FILE] [--players N] [--two-dice] [--optional-ladders]
+"""
+import argparse
+import math
+import sqlite3
+import time
+
+from board import DEFAULT_BOARD, load_board
+from farm import Histograms
+from variants import Rules
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    board TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    source TEXT NOT NULL,
+    seed INTEGER,
+    winner INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    snake_hits INTEGER NOT NULL,
+    ladder_hits INTEGER NOT NULL,
+    bounces INTEGER NOT NULL,
+    played REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    board TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    source TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    turns_squared INTEGER NOT NULL,
+    snake_hits INTEGER NOT NULL,
+    ladder_hits INTEGER NOT NULL,
+    bounces INTEGER NOT NULL,
+    PRIMARY KEY (board, players, rules, source)
+);
+CREATE TABLE IF NOT EXISTS wins (
+    board TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    source TEXT NOT NULL,
+    seat INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (board, players, rules, source, seat)
+);
+CREATE TABLE IF NOT EXISTS lengths (
+    board TEXT NOT NULL,
+    players INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    source TEXT NOT NULL,
+    turns INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    PRIMARY KEY (board, players, rules, source, turns)
+);
+"""
+
+
+def counter_sum(counter):
+    return sum(value * count for value, count in counter.items())
+
+
+class StatsSummary:
+    """Aggregates for one board and player count, ready to display"""
+
+    def __init__(self, num_players, games=0, turns=0, turns_squared=0, snake_hits=0,
+                 ladder_hits=0, bounces=0, wins=None, lengths=None):
+        self.num_players = num_players
+        self.games = games
+        self.turns = turns
+        self.turns_squared = turns_squared
+        self.snake_hits = snake_hits
+        self.ladder_hits = ladder_hits
+        self.bounces = bounces
+        # seat -> games won, turns -> games of that length
+        self.wins = wins or {}
+        self.lengths = lengths or {}
+
+    def mean_turns(self):
+        return self.turns / max(1, self.games)
+
+    def std_turns(self):
+        if not self.games:
+            return 0.0
+        mean = self.mean_turns()
+        return math.sqrt(max(0.0, self.turns_squared / self.games - mean * mean))
+
+    def win_rates(self):
+        return [self.wins.get(seat, 0) / max(1, self.games) for seat in range(self.num_players)]
+
+    def per_game(self, total):
+        return total / max(1, self.games)
+
+    def length_histogram(self, bins=12, coverage=0.99):
+        """(bin width, counts) over game lengths, the tail folded into the last bin"""
+        if not self.lengths:
+            return 1, [0] * bins
+        # Stop at the length that covers most games so one long game doesn't squash the rest
+        cutoff = max(self.lengths)
+        seen = 0
+        for turns in sorted(self.lengths):
+            seen += self.lengths[turns]
+            if seen >= coverage * self.games:
+                cutoff = turns
+                break
+        width = max(1, math.ceil(cutoff / bins))
+        counts = [0] * bins
+        for turns, games in self.lengths.items():
+            counts[min(bins - 1, (turns - 1) // width)] += games
+        return width, counts
+
+
+class StatsStore:
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        # Stores from before rule variants were recorded would mix them
+        columns = [row[1] for row in self.db.execute("PRAGMA table_info(games)")]
+        if columns and "rules" not in columns:
+            self.db.close()
+            raise ValueError(f"{path} predates per-variant statistics; use a new stats file")
+        self.db.executescript(SCHEMA)
+        # Bumped on every write; readers cache summaries against it
+        self.version = 0
+
+    def close(self):
+        self.db.close()
+
+    def record(self, result, board=DEFAULT_BOARD, num_players=2, source="game", seed=None,
+               rules=None):
+        """Append one engine.GameResult and fold it into the aggregates"""
+        rules = rules or Rules()
+        histograms = Histograms()
+        histograms.add(result)
+        with self.db:
+            self.db.execute(
+                "INSERT INTO games (board, players, rules, source, seed, winner, turns,"
+                " snake_hits, ladder_hits, bounces, played)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (board.hash, num_players, rules.key, source, seed, result.winner, result.turns,
+                 result.snake_hits, result.ladder_hits, result.bounces, time.time())
+            )
+            self.update(histograms, board, num_players, rules, source)
+        self.version += 1
+
+    def record_histograms(self, histograms, board=DEFAULT_BOARD, num_players=2,
+                          source="simulation", rules=None):
+        """Fold a batch of simulated games into the aggregates"""
+        with self.db:
+            self.update(histograms, board, num_players, rules or Rules(), source)
+        self.version += 1
+
+    def update(self, histograms, board, num_players, rules, source):
+        """Add histograms to the aggregate rows, inside the caller's transaction"""
+        key = (board.hash, num_players, rules.key, source)
+        turns_squared = sum(turns * turns * count for turns, count in histograms.turns.items())
+        self.db.execute(
+            "INSERT INTO totals VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (board, players, rules, source) DO UPDATE SET"
+            " games = games + excluded.games, turns = turns + excluded.turns,"
+            " turns_squared = turns_squared + excluded.turns_squared,"
+            " snake_hits = snake_hits + excluded.snake_hits,"
+            " ladder_hits = ladder_hits + excluded.ladder_hits,"
+            " bounces = bounces + excluded.bounces",
+            key + (histograms.games, counter_sum(histograms.turns), turns_squared,
+                   counter_sum(histograms.snake_hits), counter_sum(histograms.ladder_hits),
+                   counter_sum(histograms.bounces))
+        )
+        self.db.executemany(
+            "INSERT INTO wins VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (board, players, rules, source, seat) DO UPDATE SET"
+            " games = games + excluded.games",
+            [key + (seat, count) for seat, count in histograms.winners.items()]
+        )
+        self.db.executemany(
+            "INSERT INTO lengths VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (board, players, rules, source, turns) DO UPDATE SET"
+            " games = games + excluded.games",
+            [key + (turns, count) for turns, count in histograms.turns.items()]
+        )
+
+    def summary(self, board=DEFAULT_BOARD, num_players=2, source=None, rules=None):
+        """StatsSummary for one rule variant, over every source unless one is given
+
+        Variants play differently, so they are never mixed; rules defaults
+        to the standard single-die game.
+        """
+        where = "board = ? AND players = ? AND rules = ?"
+        params = [board.hash, num_players, (rules or Rules()).key]
+        if source is not None:
+            where += " AND source = ?"
+            params.append(source)
+
+        totals = self.db.execute(
+            "SELECT COALESCE(SUM(games), 0), COALESCE(SUM(turns), 0),"
+            " COALESCE(SUM(turns_squared), 0), COALESCE(SUM(snake_hits), 0),"
+            " COALESCE(SUM(ladder_hits), 0), COALESCE(SUM(bounces), 0)"
+            f" FROM totals WHERE {where}", params
+        ).fetchone()
+        wins = dict(self.db.execute(
+            f"SELECT seat, SUM(games) FROM wins WHERE {where} GROUP BY seat", params
+        ))
+        lengths = dict(self.db.execute(
+            f"SELECT turns, SUM(games) FROM lengths WHERE {where} GROUP BY turns", params
+        ))
+        return StatsSummary(num_players, *totals, wins=wins, lengths=lengths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print aggregate statistics from a stats store")
+    parser.add_argument("path")
+    parser.add_argument("--board", help="board file (default: classic)")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--source", help="only games from this source, e.g. game or simulation")
+    parser.add_argument("--two-dice", action="store_true", help="games rolling two dice")
+    parser.add_argument("--optional-ladders", action="store_true", help="games with optional ladders")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+    rules = Rules(2 if args.two_dice else 1, args.optional_ladders)
+    store = StatsStore(args.path)
+    summary = store.summary(board, args.players, args.source, rules)
+    store.close()
+
+    print(f"{summary.games} games on {board.name!r} with {args.players} players, rules {rules.key}")
+    print(f"Mean turns: {summary.mean_turns():.2f} +/- {summary.std_turns():.2f}")
+    print(f"Win rates: {', '.join(f'{r:.4f}' for r in summary.win_rates())}")
+    print(f"Per game: {summary.per_game(summary.snake_hits):.2f} snakes,"
+          f" {summary.per_game(summary.ladder_hits):.2f} ladders,"
+          f" {summary.per_game(summary.bounces):.2f} bounces")
@@ -0,0 +1,60 @@
+"""Board validation tests.
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import DEFAULT_BOARD, Board, BoardError  # noqa: E402
+from engine import Engine  # noqa: E402
+
+
+class BoardValidationTest(unittest.TestCase):
+    def assertRejected(self, message, *args, **kwargs):
+        with self.assertRaisesRegex(BoardError, message):
+            Board(*args, **kwargs)
+
+    def test_classic_board_is_valid(self):
+        self.assertEqual(DEFAULT_BOARD.size, 100)
+        self.assertEqual(DEFAULT_BOARD.jumps[16], 6)
+        self.assertEqual(DEFAULT_BOARD.jumps[80], 100)
+
+    def test_trap_that_cannot_be_left(self):
+        # Snakes cover every roll out of 50 and lead straight back to it
+        snakes = {cell: 50 for cell in range(51, 57)}
+        self.assertRejected("can never finish", snakes, {1: 50, 40: 60})
+
+    def test_unreachable_win_cell(self):
+        snakes = {94: 1, 95: 2, 96: 3, 97: 5, 98: 7, 99: 8}
+        self.assertRejected("cannot be reached", snakes, {})
+
+    def test_board_shorter_than_die(self):
+        self.assertRejected("needs more than 6 cells", {}, {}, size=6, columns=3)
+        board = Board({}, {}, size=7, columns=7)
+        with self.assertRaisesRegex(BoardError, "needs more than 8 cells"):
+            Engine(board, sides=8)
+
+    def test_chain(self):
+        self.assertRejected("chain", {30: 10}, {5: 30})
+
+    def test_cycle(self):
+        self.assertRejected("cycle", {30: 10}, {10: 30})
+
+    def test_overlap(self):
+        self.assertRejected("both a snake and a ladder", {30: 10}, {30: 50})
+
+    def test_endpoints_and_directions(self):
+        self.assertRejected("outside the board", {}, {0: 10})
+        self.assertRejected("outside the board", {}, {90: 101})
+        self.assertRejected("does not go up", {}, {40: 20})
+        self.assertRejected("does not go down", {20: 40}, {})
+
+    def test_duplicate_start(self):
+        self.assertRejected("defined twice", [(30, 10), (30, 5)], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
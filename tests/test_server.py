@@ -0,0 +1,131 @@
+"""Loopback tests for the asyncio game server.
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import replay  # noqa: E402
+from server import MAX_LINE, Client, GameServer  # noqa: E402
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.logs = tempfile.TemporaryDirectory()
+        self.server = GameServer(seed=0, log_dir=self.logs.name)
+        self.listener = await self.server.start(port=0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            client.writer.close()
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.logs.cleanup()
+
+    async def connect(self):
+        client = await Client.connect(port=self.port)
+        self.clients.append(client)
+        return client
+
+    async def seat_room(self, name="room", players=2):
+        """Connect and join players clients, returning them once the room starts"""
+        clients = [await self.connect() for _ in range(players)]
+        for client in clients:
+            client.send(op="join", room=name, players=players)
+        for seat, client in enumerate(clients):
+            joined = await client.receive()
+            self.assertEqual(joined["type"], "joined")
+            self.assertEqual(joined["seat"], seat)
+            self.assertEqual(joined["players"], players)
+        for client in clients:
+            self.assertEqual(await client.receive(), {"type": "start", "next": 0})
+        return clients
+
+    async def test_join_and_start(self):
+        await self.seat_room()
+        self.assertEqual(len(self.server.rooms), 1)
+        # A third player finds the room full
+        late = await self.connect()
+        late.send(op="join", room="room")
+        self.assertEqual((await late.receive())["type"], "error")
+
+    async def play_to_end(self, clients):
+        """Roll in turn until someone wins and return the winning delta"""
+        seat = 0
+        while True:
+            clients[seat].send(op="roll")
+            delta = await clients[seat].receive()
+            await clients[1 - seat].receive()
+            if "winner" in delta:
+                return delta
+            seat = delta["next"]
+
+    async def test_turn_order(self):
+        clients = await self.seat_room()
+        clients[1].send(op="roll")
+        error = await clients[1].receive()
+        self.assertEqual(error["message"], "not your turn")
+
+        seat = 0
+        for turn in range(1, 1000):
+            clients[seat].send(op="roll")
+            delta = await clients[seat].receive()
+            # Everyone sees the same delta
+            self.assertEqual(await clients[1 - seat].receive(), delta)
+            self.assertEqual(delta["type"], "turn")
+            self.assertEqual(delta["turn"], turn)
+            self.assertEqual(delta["seat"], seat)
+            if "winner" in delta:
+                self.assertEqual(delta["to"], self.server.engine.win_cell)
+                break
+            self.assertEqual(delta["next"], 1 - seat)
+            seat = delta["next"]
+        else:
+            self.fail("game did not finish")
+
+        clients[seat].send(op="roll")
+        self.assertEqual((await clients[seat].receive())["message"], "game over, send rematch")
+
+    async def test_games_replay_from_logs(self):
+        clients = await self.seat_room()
+        seed = self.server.rooms["room"].seed
+        delta = await self.play_to_end(clients)
+        state = replay(os.path.join(self.logs.name, f"server-{seed}.jsonl"))
+        self.assertEqual(state.winner, delta["winner"])
+        self.assertEqual(state.turn, delta["turn"])
+
+        # A rematch logs its game under the new seed
+        clients[0].send(op="rematch")
+        start = await clients[0].receive()
+        await clients[1].receive()
+        delta = await self.play_to_end(clients)
+        state = replay(os.path.join(self.logs.name, f"server-{start['seed']}.jsonl"))
+        self.assertEqual((state.winner, state.turn), (delta["winner"], delta["turn"]))
+
+    async def test_malformed_lines(self):
+        client = await self.connect()
+        for line in (b"not json\n", b"[1, 2]\n"):
+            client.writer.write(line)
+            error = await client.receive()
+            self.assertEqual(error, {"type": "error", "message": "expected a JSON object"})
+        client.send(op="join", room="room", players=True)
+        self.assertEqual((await client.receive())["type"], "error")
+        # The connection survives bad requests
+        client.send(op="join", room="room", players=1)
+        self.assertEqual((await client.receive())["type"], "joined")
+
+    async def test_oversize_line_closes_connection(self):
+        client = await self.connect()
+        client.writer.write(b"x" * (MAX_LINE + 100))
+        with self.assertRaises(ConnectionError):
+            await client.receive()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+"""Fixed-timestep simulation clock.
+
+Rendering runs at whatever rate the display manages, while game logic is
+advanced in fixed steps of STEP seconds. Frame deltas accumulate and are
+drained one step at a time; the fraction left over is exposed as alpha so
+the renderer can interpolate between the last two simulation states.
+"""
+
+SIM_RATE = 60
+STEP = 1.0 / SIM_RATE
+
+
+class FixedTimestep:
+    def __init__(self, step=STEP, max_steps=8):
+        self.step = step
+        # Cap catch-up work after a long stall (e.g. window dragging)
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.time = 0.0
+
+    def advance(self, dt):
+        """Add a frame delta in seconds and return how many steps to run"""
+        self.accumulator += dt
+        # The epsilon stops float rounding from losing a step now and then
+        steps = int(self.accumulator / self.step + 1e-9)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        self.time += steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """How far the renderer is between the last step and the next one"""
+        return max(0.0, self.accumulator / self.step)
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.time = 0.0
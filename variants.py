@@ -0,0 +1,260 @@
+"""Rule variants that give players decisions, and an expectimax AI for them.
+
+Rules(dice=2) rolls two dice and lets the player move by either one;
+Rules(optional_ladders=True) lets a player decline a ladder they land on.
+Rules.options lists the distinct moves a roll allows.
+
+The AI searches an expectimax tree - the player to move picks the option
+maximizing their own win probability, dice outcomes are averaged - with
+iterative deepening under a per-move time budget and a transposition table
+keyed on (positions, seat to move, depth). Leaves are scored exactly from
+precomputed value tables: for every cell, the distribution of rolls needed
+to finish when always taking the move with the lowest expected rolls left.
+Players never interact, so those per-cell distributions combine into exact
+win probabilities for every seat under that policy.
+
+Searches run in a worker process (see choose_move) so the render loop in
+Game.run never waits on them.
+"""
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from engine import DICE_SIDES, HIT_LADDER, HIT_NONE, Engine, land, roll_die
+
+Option = namedtuple("Option", ["roll", "to", "hit", "bounced"])
+Option.__doc__ = """One legal move: the die used, destination cell, hit type and bounce flag"""
+
+# Transposition table entries kept before the table is cleared
+TABLE_LIMIT = 500000
+
+# Engine and AI for the current worker process, built once by init_worker
+_worker_ai = None
+
+
+class Rules:
+    def __init__(self, dice=1, optional_ladders=False):
+        if dice not in (1, 2):
+            raise ValueError("dice must be 1 or 2")
+        self.dice = dice
+        self.optional_ladders = optional_ladders
+
+    def __repr__(self):
+        return f"Rules(dice={self.dice}, optional_ladders={self.optional_ladders})"
+
+    @property
+    def key(self):
+        """Short stable name for the variant, such as 1d or 2d+optional-ladders"""
+        key = f"{self.dice}d"
+        if self.optional_ladders:
+            key += "+optional-ladders"
+        return key
+
+    @property
+    def has_choices(self):
+        return self.dice > 1 or self.optional_ladders
+
+    def to_dict(self):
+        return {"dice": self.dice, "optional_ladders": self.optional_ladders}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("dice", 1), data.get("optional_ladders", False))
+
+    def roll(self, rng, sides=DICE_SIDES):
+        """Roll every die with engine.roll_die, in order"""
+        return tuple(roll_die(rng, sides) for _ in range(self.dice))
+
+    def outcomes(self, sides=DICE_SIDES):
+        """Distinct rolls as (dice, probability), ignoring dice order"""
+        if self.dice == 1:
+            return [((roll,), 1.0 / sides) for roll in range(1, sides + 1)]
+        pair = 1.0 / (sides * sides)
+        return [((a, b), pair if a == b else 2 * pair)
+                for a in range(1, sides + 1) for b in range(a, sides + 1)]
+
+    def options(self, engine, position, rolls):
+        """Moves the rolls allow from position, one per distinct destination"""
+        options = {}
+        for roll in rolls:
+            new_pos, hit, bounced = engine.resolve(position, roll)
+            options.setdefault(new_pos, Option(roll, new_pos, hit, bounced))
+            if hit == HIT_LADDER and self.optional_ladders:
+                landed = land(position, roll, engine.win_cell)
+                options.setdefault(landed, Option(roll, landed, HIT_NONE, bounced))
+        return list(options.values())
+
+
+class ValueTables:
+    """Per-cell finishing distributions under the fewest-expected-rolls policy"""
+
+    def __init__(self, engine, rules, tol=1e-10, max_turns=5000, max_iterations=100000):
+        self.engine = engine
+        self.rules = rules
+        win_cell = engine.win_cell
+        outcomes = rules.outcomes(engine.sides)
+        self.probabilities = np.array([p for _, p in outcomes])
+
+        # Destinations for every (cell, outcome, option), padded by repeating the first
+        width = 2 * rules.dice
+        self.destinations = np.zeros((win_cell + 1, len(outcomes), width), dtype=np.int64)
+        for position in range(win_cell + 1):
+            for index, (rolls, _) in enumerate(outcomes):
+                cells = [option.to for option in rules.options(engine, position, rolls)]
+                self.destinations[position, index] = cells + cells[:1] * (width - len(cells))
+        self.destinations[win_cell] = win_cell
+
+        self.expected = self.expected_rolls(tol, max_iterations)
+        # The policy picks the option with the fewest expected rolls left
+        choice = self.expected[self.destinations].argmin(axis=2)
+        policy = np.take_along_axis(self.destinations, choice[..., None], axis=2)[..., 0]
+        self.finish = self.finishing_distribution(policy, tol, max_turns)
+        self.survival = np.clip(1.0 - np.cumsum(self.finish, axis=1), 0.0, 1.0)
+        # survival shifted one roll later, with certainty of not finishing in 0 rolls
+        self.survival_before = np.concatenate(
+            (np.ones((win_cell + 1, 1)), self.survival[:, :-1]), axis=1
+        )
+        self.survival_before[win_cell, 0] = 0.0
+
+    def expected_rolls(self, tol, max_iterations):
+        """Value iteration for the fewest expected rolls to finish from each cell"""
+        win_cell = self.engine.win_cell
+        expected = np.zeros(win_cell + 1)
+        for _ in range(max_iterations):
+            best = expected[self.destinations].min(axis=2)
+            updated = 1.0 + best @ self.probabilities
+            updated[win_cell] = 0.0
+            if np.abs(updated - expected).max() < tol:
+                return updated
+            expected = updated
+        # Values keep growing on boards where some cells can never finish
+        raise ValueError(f"expected rolls did not converge in {max_iterations} iterations")
+
+    def finishing_distribution(self, policy, tol, max_turns):
+        """finish[cell, t]: probability of finishing on exactly roll t from cell"""
+        win_cell = self.engine.win_cell
+        columns = [np.zeros(win_cell + 1)]
+        columns[0][win_cell] = 1.0
+        # Probability of having finished within t rolls, per starting cell
+        done = columns[0].copy()
+        for _ in range(max_turns):
+            done_next = done[policy] @ self.probabilities
+            done_next[win_cell] = 1.0
+            column = done_next - done
+            column[win_cell] = 0.0
+            columns.append(column)
+            done = done_next
+            if 1.0 - done.min() < tol:
+                break
+        return np.stack(columns, axis=1)
+
+    def win_probabilities(self, positions, seat):
+        """Exact win probability of every seat with seat to move, under the policy"""
+        count = len(positions)
+        finish = self.finish[list(positions)]
+        result = np.zeros(count)
+        for k in range(count):
+            order = (k - seat) % count
+            chance = finish[k].copy()
+            for j in range(count):
+                if j == k:
+                    continue
+                # Seats moving before k in the cycle have rolled t times, the others t - 1
+                if (j - seat) % count < order:
+                    chance *= self.survival[positions[j]]
+                else:
+                    chance *= self.survival_before[positions[j]]
+            result[k] = chance.sum()
+        return result
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search when the move's time budget runs out"""
+
+
+class ExpectimaxAI:
+    def __init__(self, engine, rules, budget=0.25, max_depth=8, tables=None):
+        self.engine = engine
+        self.rules = rules
+        self.budget = budget
+        self.max_depth = max_depth
+        self.tables = tables or ValueTables(engine, rules)
+        self.outcomes = rules.outcomes(engine.sides)
+        # (positions, seat, depth) -> win probability per seat
+        self.table = {}
+        self.leaves = {}
+        self.deadline = None
+
+    def leaf(self, positions, seat):
+        key = (positions, seat)
+        value = self.leaves.get(key)
+        if value is None:
+            value = self.leaves[key] = self.tables.win_probabilities(positions, seat)
+        return value
+
+    def after(self, positions, seat, destination, depth):
+        """Value of the position after seat moves to destination"""
+        if destination == self.engine.win_cell:
+            value = np.zeros(len(positions))
+            value[seat] = 1.0
+            return value
+        moved = positions[:seat] + (destination,) + positions[seat + 1:]
+        return self.value(moved, (seat + 1) % len(positions), depth - 1)
+
+    def value(self, positions, seat, depth):
+        """Expected win probabilities with seat about to roll"""
+        if depth <= 0:
+            return self.leaf(positions, seat)
+        key = (positions, seat, depth)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        value = np.zeros(len(positions))
+        position = positions[seat]
+        for rolls, probability in self.outcomes:
+            best = None
+            for option in self.rules.options(self.engine, position, rolls):
+                child = self.after(positions, seat, option.to, depth)
+                if best is None or child[seat] > best[seat]:
+                    best = child
+            value += probability * best
+        self.table[key] = value
+        return value
+
+    def choose(self, positions, seat, options):
+        """Index of the best option, deepening the search until the budget runs out"""
+        positions = tuple(positions)
+        if len(options) == 1:
+            return 0
+        if len(self.table) > TABLE_LIMIT:
+            self.table.clear()
+            self.leaves.clear()
+
+        self.deadline = time.perf_counter() + self.budget
+        # Depth 0 ranks options by the value tables alone
+        best = self.best_option(positions, seat, options, 0)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = self.best_option(positions, seat, options, depth)
+            except SearchTimeout:
+                break
+        return best
+
+    def best_option(self, positions, seat, options, depth):
+        values = [self.after(positions, seat, option.to, depth + 1)[seat] for option in options]
+        return max(range(len(options)), key=values.__getitem__)
+
+
+def init_worker(board, rules, budget):
+    """Build the worker's engine, value tables and search once"""
+    global _worker_ai
+    _worker_ai = ExpectimaxAI(Engine(board), rules, budget)
+
+
+def choose_move(positions, seat, options):
+    """Worker entry point: index of the option the AI picks"""
+    return _worker_ai.choose(positions, seat, options)
@@ -0,0 +1,83 @@
+"""Camera and spatial index for boards larger than the window.
+
+The camera maps world coordinates (board pixels) to the screen and follows
+a target smoothly. The spatial index buckets snakes and ladders by the
+world-space area they cover, so drawing only has to look at what is inside
+the visible rect, and frame cost depends on what is on screen rather than
+on board size.
+"""
+import math
+
+import pygame
+
+
+class Camera:
+    def __init__(self, view_size, world_size, smoothing=0.1):
+        self.width, self.height = view_size
+        self.world_width, self.world_height = world_size
+        # Fraction of the remaining distance covered per simulation step
+        self.smoothing = smoothing
+        self.x = 0.0
+        self.y = 0.0
+
+    @property
+    def offset(self):
+        """Integer world -> screen translation"""
+        return -int(self.x), -int(self.y)
+
+    @property
+    def visible_rect(self):
+        """The world-space rect currently on screen"""
+        return pygame.Rect(int(self.x), int(self.y), self.width, self.height)
+
+    def clamp(self):
+        self.x = min(max(0.0, self.x), max(0.0, self.world_width - self.width))
+        self.y = min(max(0.0, self.y), max(0.0, self.world_height - self.height))
+
+    def center_on(self, x, y):
+        """Jump straight to a world position"""
+        self.x = x - self.width / 2
+        self.y = y - self.height / 2
+        self.clamp()
+
+    def follow(self, x, y):
+        """Ease towards centering a world position"""
+        self.x += (x - self.width / 2 - self.x) * self.smoothing
+        self.y += (y - self.height / 2 - self.y) * self.smoothing
+        self.clamp()
+
+    def to_screen(self, x, y):
+        """Screen position of a world point, translated by the same offset as the board"""
+        ox, oy = self.offset
+        return int(x + ox), int(y + oy)
+
+
+class SpatialIndex:
+    """Uniform grid of buckets mapping world areas to items"""
+
+    def __init__(self, bucket_size=256):
+        self.bucket_size = bucket_size
+        self.buckets = {}
+
+    def _bucket_range(self, rect):
+        size = self.bucket_size
+        return (
+            range(math.floor(rect.left / size), math.floor((rect.right - 1) / size) + 1),
+            range(math.floor(rect.top / size), math.floor((rect.bottom - 1) / size) + 1),
+        )
+
+    def insert(self, item, rect):
+        xs, ys = self._bucket_range(rect)
+        for bx in xs:
+            for by in ys:
+                self.buckets.setdefault((bx, by), []).append(item)
+
+    def query(self, rect):
+        """Items whose area may overlap rect, each reported once"""
+        found = {}
+        xs, ys = self._bucket_range(rect)
+        for bx in xs:
+            for by in ys:
+                for item in self.buckets.get((bx, by), ()):
+                    found[id(item)] = item
+        return list(found.values())